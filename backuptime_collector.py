@@ -1,9 +1,10 @@
 # Modules that will be used on the script
 # Made sure that we use modules that are pre-installed on python 2.6 to avoid adding modules via pip
 # as most customers don't have internet connection or is blocked on the main server.
-import sys, os, getopt, logging, subprocess, csv, glob, re, json, time
+import sys, os, getopt, logging, subprocess, csv, glob, re, json, time, threading, Queue, multiprocessing
+import atexit, shutil, tempfile, gzip, bz2, math, cPickle, mmap, inspect, resource, cProfile, pipes, hashlib
 from operator import itemgetter
-from datetime import datetime
+from datetime import datetime, timedelta
 from time import gmtime, strftime
 
 
@@ -25,6 +26,17 @@ class VariableClass():
         self.row_query = 24
         self.row_dumplocation = 18
 
+        # Every row of the csv logfile starts with the timestamp, the lines that doesn't are
+        # continuation of the multi line statement from the previous row.
+        self.row_start = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}')
+
+        # The readers only look at the rows that has one of the below text, i.e the duration of the statement,
+        # the LOCK TABLE of the backup process and the gp_dump_agent command line with the dump.
+        self.row_filter = ('duration:', 'LOCK TABLE', 'gp_dump_agent command line')
+
+        # The plain logfiles are searched for the above text in slices of the below size (bytes)
+        self.logslice = 4194304
+
         # Default parameters to be set for script arguments.
         self.StartTime = None
         self.EndTime = None
@@ -33,6 +45,51 @@ class VariableClass():
         self.hostmapdates = None
         self.debug = 0
 
+        # The profile of the program, time ( of each phase ) or cprofile ( the time & the stats of the cProfile ).
+        # The phases timed, and the phases that are timed for the host passed on the argument ( position ).
+        self.profile = ''
+        self.profilemodes = ['time', 'cprofile']
+        self.profilephases = [
+            'parseHostfile', 'SshControlSetup', 'SshMaster', 'HostPipe', 'LaunchProcess', 'OutputFileMerger',
+            'RecordFileMerger', 'RunProgram', 'StripHostmap', 'InputFileMerger', 'MasterLogReader',
+            'SegmentLogReader', 'MasterLogReport', 'SegmentLogReport', 'DumpSizes.size', 'SQLOutputFormatter',
+            'SQLRecordFormatter', 'CopyOutputFormatter', 'jsonWriter', 'LogFileWriter', 'RecordWriter',
+            'ReportFiles.flush', 'ReportFiles.close', 'PayloadWriter'
+        ]
+        self.profilehostphases = {
+            'SshMaster': 0,
+            'HostPipe': 1,
+            'LaunchProcess': 0
+        }
+
+        # The trace of the stages of the program on all the hosts, and the stages traced ( also on profilephases ).
+        self.trace = False
+        self.tracephases = [
+            'SshControlSetup', 'SshMaster', 'HostPipe', 'LaunchProcess', 'OutputFileMerger', 'RecordFileMerger',
+            'RunProgram', 'StripHostmap', 'MasterLogReader', 'SegmentLogReader', 'MasterLogReport',
+            'SegmentLogReport', 'DumpSizes.size', 'SQLOutputFormatter', 'CopyOutputFormatter'
+        ]
+
+        # Size of the buffer of each log written by the program
+        self.reportbuffer = 1048576
+
+        # Number of hosts the program is launched on at the same time
+        self.parallel = 16
+
+        # The histogram of the duration of the statements, the durations (ms) are counted in buckets
+        # that grow by the ratio starting from the min duration.
+        self.latencyratio = 1.05
+        self.latencymin = 0.001
+
+        # Max number of segments on a host whose logs are read at the same time
+        self.segmentparallel = 16
+
+        # Number of threads that get the size of the dumps on the filesystem at the same time
+        self.dumpsizethreads = 4
+
+        # On the worker process that reads the logs, the queue to send the dumps found to the RunProgram
+        self.dumpsizequeue = None
+
         # Time conversion variables
         self.msTOsec = 0.001
         self.msTOmin = 0.00001667
@@ -66,26 +123,90 @@ class VariableClass():
         " AND t.oid=1663 " \
         " AND role = 'p'"
 
-        # Directory where the files will be temporary copied to
+        # Directory where the files will be temporary copied to, main replaces it by a fresh
+        # one for every run.
         self.tempdir = "/tmp/wrkdir_{0}".format(__file__)
 
+        # Directory on the host where the progress of reading the logs is saved, so that if the program is run
+        # again it continues from there. The progress is saved at most every checkpointinterval seconds,
+        # the time is checked every checkpointrows rows.
+        self.checkpointdir = os.path.join(os.path.expanduser("~"), ".{0}_checkpoint".format(os.path.basename(__file__)))
+        self.checkpointinterval = 30
+        self.checkpointrows = 10000
+
+        # The program is sent to the host on the stdin of the ssh, the below is run by the python
+        # on the host, it checks the version of python, loads the program and starts the RemoteProgram
+        self.bootstrap = "import sys, imp\n" \
+                         "if sys.hexversion < 0x020600f0:\n" \
+                         "    sys.exit(3)\n" \
+                         "name, size = sys.stdin.readline().split()\n" \
+                         "module = imp.new_module(name.split('.')[0])\n" \
+                         "module.__file__ = name\n" \
+                         "sys.modules[module.__name__] = module\n" \
+                         "exec compile(sys.stdin.read(int(size)), name, 'exec') in module.__dict__\n" \
+                         "module.RemoteProgram()\n"
+
+        # The python on the host reads the bootstrap from the stdin and runs it
+        self.bootstraploader = "import sys; exec(sys.stdin.read(int(sys.stdin.readline())))"
+
+        # How the hosts are reached, over ssh or as local process ( for testing ) with the delay (seconds)
+        # of each host before its command is run.
+        self.transport = 'ssh'
+        self.transports = ['ssh', 'local']
+        self.delays = {}
+
+        # The logs from the host are sent back on the stdout of the ssh, the payload starts with the below marker
+        self.payloadmarker = "BACKUPTIME_COLLECTOR_PAYLOAD"
+
+        # Private directory with the control socket of the ssh master connection of each host,
+        # the ssh / scp options to go through them and the hosts with a master connection.
+        self.sshcontroldir = None
+        self.sshoptions = ''
+        self.sshmasters = []
+
         # Format used in the scripts to verify the date argument
         self.StartEnddate_format = '%Y-%m-%d  %H:%M:%S'
         self.hostmapdate_format = '%Y-%m-%d'
 
         # Output File name
-        self.InputFile = "gpdb" + "_" + __file__ + "_" + strftime("%Y%m%d%H%M%S", gmtime()) + ".csv"
         self.OutputFile = __file__ + "_" + strftime("%Y%m%d%H%M%S", gmtime()) + ".out"
+
+        # Trace file name, in the trace event format ( chrome://tracing, ui.perfetto.dev )
+        self.TraceFile = os.path.splitext(self.OutputFile)[0] + ".trace.json"
+
+        # The index of the backups found on the master log, its kept on the working directory. The timestamp
+        # (key) of the backup on the gp_dump_agent command line and the format of the backup timestamp argument.
+        # The start time / end time of the backup are widen by the margin (seconds) to cover the clock difference.
+        self.backupindexfile = __file__ + "_backups.index"
+        self.backupkey = re.compile(r'\d{14}')
+        self.backupkey_format = re.compile(r'^\d{14}$')
+        self.backupmargin = 60
+
+        # Format of the structured records written along with the output file ( text means none )
+        # and the columns of the records when written as csv.
+        self.outputformat = 'text'
+        self.outputformats = ['text', 'json', 'csv']
+        self.recordcolumns = [
+            'record', 'host', 'dbid', 'content', 'mode', 'pid', 'statement', 'table', 'dump', 'file',
+            'firstdate', 'enddate', 'lockrequested', 'lockreleased', 'execution', 'totalexecution',
+            'totaltime', 'totalduration', 'maxduration', 'minduration', 'avgduration', 'p50', 'p95', 'p99',
+            'duration', 'timeunit', 'bytes'
+        ]
         self.hostmapfile = "hostmap"
 
         # Format used to format the output of the script
-        self.SQLfmt1 = '|{0:-<60}|{0:->30}|{0:->30}|{0:->15}|{0:->20}|{0:->15}|{0:->15}|{0:->20}|'
-        self.SQLfmt2 = '|{0:<60}|{1:>30}|{2:>30}|{3:>15}|{4:>20}|{5:>15}|{6:>15}|{7:>20}|'
-        self.SQLfmt3 = '|{0:<60}|{1:>30}|{2:>30}|{3:>15}|{4:>20.2f}|{5:>15.2f}|{6:>15.2f}|{7:>20.2f}|'
-        self.SQLfmt4 = '|{0:<60}|{1:>30}|{2:>30}|{3:>15}|{4:>20.2f}|{5:>15}|{6:>15}|{7:>20}|'
+        self.SQLfmt1 = '|{0:-<60}|{0:->30}|{0:->30}|{0:->15}|{0:->20}|{0:->15}|{0:->15}|{0:->20}|{0:->15}|{0:->15}|{0:->15}|'
+        self.SQLfmt2 = '|{0:<60}|{1:>30}|{2:>30}|{3:>15}|{4:>20}|{5:>15}|{6:>15}|{7:>20}|{8:>15}|{9:>15}|{10:>15}|'
+        self.SQLfmt3 = '|{0:<60}|{1:>30}|{2:>30}|{3:>15}|{4:>20.2f}|{5:>15.2f}|{6:>15.2f}|{7:>20.2f}|{8:>15.2f}|{9:>15.2f}|{10:>15.2f}|'
+        self.SQLfmt4 = '|{0:<60}|{1:>30}|{2:>30}|{3:>15}|{4:>20.2f}|{5:>15}|{6:>15}|{7:>20}|{8:>15.2f}|{9:>15.2f}|{10:>15.2f}|'
         self.Copyfmt1 = '|{0:<60}|{1:>15}|'
         self.Copyfmt2 = '|{0:->60}|{0:->15}|'
         self.Copyfmt3 = '|{0:<60}|{1:>15.2f}|'
+        self.Backupfmt1 = '|{0:-<16}|{0:->30}|{0:->30}|{0:->30}|{0:->15}|{0:->16}|'
+        self.Backupfmt2 = '|{0:<16}|{1:>30}|{2:>30}|{3:>30}|{4:>15}|{5:>16}|'
+        self.Profilefmt1 = '|{0:-<30}|{0:->30}|{0:->12}|{0:->15}|{0:->15}|{0:->15}|'
+        self.Profilefmt2 = '|{0:<30}|{1:<30}|{2:>12}|{3:>15}|{4:>15}|{5:>15}|'
+        self.Profilefmt3 = '|{0:<30}|{1:<30}|{2:>12}|{3:>15.3f}|{4:>15.3f}|{5:>15}|'
         self.date_format = "%Y-%m-%d %H:%M:%S.%f"
 
         # Copy Output Formatter variables
@@ -109,7 +230,9 @@ class VariableClass():
                     "Total Exec time(s) : The total time took by all the statements (in seconds)." + "\n" + \
                     "Longest Run(s)     : The longest run by the statement from all the execution (in seconds)" + "\n" + \
                     "Shortest Run(s)    : The longest run by the statement from all the execution (in seconds)" + "\n" + \
-                    "Average Time(s)    : The average time taken in seconds ( i.e total execution time / number of execution )" + "\n\n"
+                    "Average Time(s)    : The average time taken in seconds ( i.e total execution time / number of execution )" + "\n" + \
+                    "p50/p95/p99(s)     : 50/95/99 percent of the execution took at most this time in seconds, on the Total" + "\n" + \
+                    "                     row its for all the statements of the process ( within 5% of the actual time )" + "\n\n"
 
         # Help documentation
         self.helpdoc = "OPTIONS:\n\n" \
@@ -118,6 +241,17 @@ class VariableClass():
           "-e, --end-time=\"TIMESTAMP\"                     End timestamp of the dump   (FORMAT: YYYY-MM-DD HH:MI:SS)\n" \
           "-b, --build-hostmap=\"DATE1[,DATE2,...]\"        Dates to search for logfile (FORMAT: YYYY-MM-DD)\n" \
           "-c, --contents=content1[,content2,...]         Contents of the segments interested (Default: ALL contents)\n" \
+          "-p, --parallel=N                               Number of hosts to work on at the same time (Default: 16)\n" \
+          "-o, --output-format=text|json|csv              Also write the summary as json / csv records (Default: text)\n" \
+          "-l, --list-backups                             List the backups found on the master log of the hostmap\n" \
+          "-t, --backup=TIMESTAMP                         Timestamp of the backup, in place of -s & -e (FORMAT: YYYYMMDDHHMISS)\n" \
+          "-P, --profile=time|cprofile                    Time each phase of the program on all the hosts, with cprofile also\n" \
+          "                                               save the stats of the cProfile for each host\n" \
+          "-T, --trace                                    Write the start and end of each stage on all the hosts to a trace file\n" \
+          "-x, --transport=ssh|local                      Reach the hosts over ssh, or run each host as a local process\n" \
+          "                                               to test the program without a cluster (Default: ssh)\n" \
+          "-D, --delay=SECONDS[,HOST:SECONDS,...]         With -x local, wait before running the command of each host\n" \
+          "                                               ( or of the hosts listed ) to act like slow hosts\n" \
           "-v, --version                                  Display Version of the program \n" \
           "-d, --debug                                    Enable Debug Mode\n\n" \
           "EXAMPLE:\n\n" \
@@ -129,6 +263,19 @@ class VariableClass():
           "\t {0} -f hostmap -s \"2016-03-21 11:12:00\" -e \"2016-03-22 23:00:03\"\n\n" \
           "To enter into debug mode\n\n" \
           "\t {0} -f hostmap -s \"2016-03-21 11:12:00\" -e \"2016-03-22 23:00:03\" -d\n\n" \
+          "To run the program on 64 hosts at the same time\n\n" \
+          "\t {0} -f hostmap -s \"2016-03-21 11:12:00\" -e \"2016-03-22 23:00:03\" -p 64\n\n" \
+          "To have the summary as json records along with the output file\n\n" \
+          "\t {0} -f hostmap -s \"2016-03-21 11:12:00\" -e \"2016-03-22 23:00:03\" -o json\n\n" \
+          "To list the backups found on the master log and then execute the script for one of them\n\n" \
+          "\t {0} -f hostmap -l\n" \
+          "\t {0} -f hostmap -t 20160321111200\n\n" \
+          "To know where the time of the program went on each host\n\n" \
+          "\t {0} -f hostmap -s \"2016-03-21 11:12:00\" -e \"2016-03-22 23:00:03\" -P time\n\n" \
+          "To see when each host did what, open the trace file written by the below on chrome://tracing or ui.perfetto.dev\n\n" \
+          "\t {0} -f hostmap -s \"2016-03-21 11:12:00\" -e \"2016-03-22 23:00:03\" -T\n\n" \
+          "To run the hosts of the hostmap as local process, each host taking 0.5 seconds more and sdw7 30 seconds more\n\n" \
+          "\t {0} -f hostmap -s \"2016-03-21 11:12:00\" -e \"2016-03-22 23:00:03\" -x local -D 0.5,sdw7:30\n\n" \
           "COLUMN DESCRIPTION:\n\n".format(__file__) \
           + self.ColumnDescription + \
           "GENERAL INFORMATION:\n\n" \
@@ -136,8 +283,14 @@ class VariableClass():
           "-- Ensure that log_duration GUC is turned ON for all the segments \n" \
           "-- If there are files (ends with .log) in the working directory make sure its moved or renamed to avoid conflict \n" \
           "-- Arguments -b & -c cannot run along with -f,-s,-e\n" \
+          "-- Arguments -l & -t need the master logfile, so run the script on the master host\n" \
           "-- Make sure the clock of segments servers are in sync\n" \
-          "-- Script only gets the segment content information that are current primaries when the script is called\n"
+          "-- Script only gets the segment content information that are current primaries when the script is called\n" \
+          "-- The progress of reading the logs is saved on the hosts under ~/.{0}_checkpoint, if the script is run again\n" \
+          "   with the same start time & end time it continues from where it stopped the last time\n" \
+          "-- With -P the time of each phase is written on <host>_{0}.profile and with cprofile the stats of the\n" \
+          "   cProfile on *_{0}.prof ( open them with pstats ), Self(s) is the time without the phases called by the phase\n" \
+          "-- The times on the trace are the clock of each host, so the clock of the hosts should be in sync\n".format(os.path.basename(__file__))
 
 
 # Store all those variables on the variables,
@@ -147,6 +300,10 @@ globalVariable = VariableClass()
 # The logger process to log information of the screen
 logger = globalVariable.logger
 
+# Since the program runs on many hosts at the same time, the output from the hosts
+# is written one line at a time holding this lock, so that the lines don't get mixed up.
+OutputLock = threading.Lock()
+
 
 # Function: Usage(text)
 # This function is used by the arguments checker
@@ -161,6 +318,14 @@ def Usage(text):
         "-e [--end-time] "
         "-b [--build-hostmap] "
         "-c [--contents]  "
+        "-p [--parallel] "
+        "-o [--output-format] "
+        "-l [--list-backups] "
+        "-t [--backup] "
+        "-P [--profile] "
+        "-T [--trace] "
+        "-x [--transport] "
+        "-D [--delay] "
         "-v [--version]"
         "-d [--debug] "
         "-h [--help] \n".format(
@@ -215,37 +380,102 @@ def hostmapWriter(file, data):
     fo.close()
 
 
+# Class: ReportWriter()
+# This class holds a buffered file for each of the log (i.e <dbid>_<host>_<program>.log) for the whole run
+# rather than opening and closing the log for each line written. The contents are written to the disk
+# on flush (i.e at the end of each segment) and on close.
+class ReportWriter():
+    def __init__(self):
+        self.files = {}
+
+    # Write the text on the log of the dbid and host.
+    def write(self, text, dbid, host):
+
+        fo = self.files.get((dbid, host))
+        if fo is None:
+            outputfile = dbid + "_" + host + "_" + __file__ + ".log"
+
+            # Lets try to open the file
+            try:
+                fo = open(outputfile, "a", globalVariable.reportbuffer)
+
+            # If we receive any exception during the opening of file
+            # Lets error out
+            except IOError:
+                logger.error("Unable to create the outputfile file: \"{0}\" in the directory: \"{1}\"".format(
+                    outputfile,
+                    os.getcwd()
+                ))
+                sys.exit(2)
+
+            self.files[(dbid, host)] = fo
+
+        fo.write(text)
+
+    # Write the record on the records of the host, one line of JSON for each record.
+    def record(self, data, host):
+
+        fo = self.files.get(('records', host))
+        if fo is None:
+            outputfile = host + "_" + __file__ + ".records"
+
+            # Lets try to open the file
+            try:
+                fo = open(outputfile, "a", globalVariable.reportbuffer)
+            except IOError:
+                logger.error("Unable to create the records file: \"{0}\" in the directory: \"{1}\"".format(
+                    outputfile,
+                    os.getcwd()
+                ))
+                sys.exit(2)
+
+            self.files[('records', host)] = fo
+
+        fo.write(json.dumps(data, separators=(',', ':')) + "\n")
+
+    # Write the contents of all the logs to the disk.
+    def flush(self):
+        for fo in self.files.values():
+            fo.flush()
+
+    # Write the contents and close all the logs.
+    def close(self):
+        for fo in self.files.values():
+            fo.close()
+        self.files = {}
+
+
+# The logs written by the program
+ReportFiles = ReportWriter()
+
+
 # Function: LogFileWriter(text, dbid, host)
 # This function when called write the information on the log
-# Since the script is run from tempdir folder we dont need to provide the location.
+# Since the script is run from the work directory we dont need to provide the location.
 def LogFileWriter(text, dbid, host):
+    ReportFiles.write(text, dbid, host)
 
-    # Local Variable
-    tempdir = globalVariable.tempdir
-    outputfile = dbid + "_" + host + "_" + __file__ + ".log"
 
-    # Lets try to open the file
-    try:
-        fo = open(outputfile, "a+")
+# Function: RecordWriter(data, segInfo)
+# If the structured records are asked for, write the record with the information of the segment
+# on the records of the host.
+def RecordWriter(data, segInfo):
 
-    # If we receive any exception during the opening of file
-    # Lets error out
-    except IOError:
-        logger.error("Unable to create the outputfile file: \"{0}\" in the directory: \"{1}\"".format(
-            outputfile,
-            tempdir
-        ))
-        sys.exit(2)
+    if globalVariable.outputformat == 'text':
+        return
 
-    # write the data
-    with fo as output:
-        output.write(text)
-    fo.close()
+    record = {
+        'host': segInfo['host'],
+        'dbid': segInfo['dbid'],
+        'content': segInfo['content']
+    }
+    record.update(data)
+    ReportFiles.record(record, segInfo['host'])
 
 
 # Function : jsonWriter(appenddata, jsondatafile)
 # This writer process will keep appending the data from
-# copy collector to a file in JSONformat and it will keep
+# copy collector to a file, one line of JSON for each segment and it will keep
 # appending until we finish all the collection on the segment host
 def jsonWriter(appenddata, jsondatafile):
 
@@ -253,104 +483,545 @@ def jsonWriter(appenddata, jsondatafile):
         jsondatafile
     ))
 
-    # First lets open the file if exists
-    try:
-        with open(jsondatafile) as f:
+    # The data of the segment is added at the end of the file, the data already on the file
+    # is read only once by the copy formatter.
+    with open(jsondatafile, 'a') as outfile:
+        outfile.write(json.dumps(appenddata, separators=(',', ':')) + "\n")
+
+
+# Function : jsonReader(jsondatafile)
+# Read the data of all the segments appended by the jsonWriter in a single pass
+def jsonReader(jsondatafile):
+
+    # Local Variables
+    data = {}
+
+    with open(jsondatafile) as file:
+        for line in file:
+            if line.strip():
+                data.update(json.loads(line))
+
+    return data
+
+
+# Class: PhaseProfiler()
+# When the profile is asked for, the functions of each phase of the program ( globalVariable.profilephases )
+# are replaced by the ones that time each call. The time of the phase is kept along with the time spend in the
+# phase itself ( self ), i.e without the time of the other phases called by it, so the self time of the phases
+# of a process adds up to the time of the process. The phases of the host are timed on the host ( the worker
+# process that read the logs included ) and sent back with the logs, the ssh to the host is timed on the main host.
+# When the trace is asked for, the start and end of each call of the stages ( globalVariable.tracephases ) are
+# kept as the events of the host, the process and the segment it was for.
+class PhaseProfiler():
+    def __init__(self):
+        self.mode = ''
+        self.trace = False
+        self.host = None
+        self.pid = None
+        self.phases = {}
+        self.order = []
+        self.events = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    # Start timing the phases of the program on the host, mode is time or cprofile ( along with the time ).
+    # If only the trace is asked for, only the stages are timed.
+    def enable(self, mode, trace, host):
+
+        if not mode and not trace:
+            return
+
+        self.mode = mode
+        self.trace = trace
+        self.host = host
+        self.pid = os.getpid()
+        module = sys.modules[__name__]
+
+        if mode:
+            phases = globalVariable.profilephases
+        else:
+            phases = globalVariable.tracephases
+
+        for name in phases:
+
+            # The phase is either a function of the program or the method of one of its objects
+            owner = module
+            attribute = name
+            if '.' in name:
+                owner, attribute = name.split('.')
+                owner = getattr(module, owner)
+
+            function = getattr(owner, attribute)
+            if inspect.isgeneratorfunction(function):
+                setattr(owner, attribute, self.timedrows(name, function))
+            else:
+                setattr(owner, attribute, self.timed(name, function))
+
+    # The host of the phase, the ssh to the host are timed for the host they are run on.
+    def phasehost(self, name, args):
+        if name in globalVariable.profilehostphases:
+            return args[globalVariable.profilehostphases[name]]
+        return self.host
+
+    # Returns the function that times each call of the function.
+    def timed(self, name, function):
+
+        def timedcall(*args, **kwargs):
+            host = self.phasehost(name, args)
+            self.begin(host, name)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.end(host, name, args)
+
+        return timedcall
+
+    # Returns the generator function that times the generator each time it is asked for the next row,
+    # like the rows of the InputFileMerger which are read by the readers as they go.
+    def timedrows(self, name, function):
+
+        def timedgenerator(*args, **kwargs):
+            host = self.phasehost(name, args)
+            rows = function(*args, **kwargs)
+            while True:
+                self.begin(host, name)
+                try:
+                    row = rows.next()
+                except StopIteration:
+                    return
+                finally:
+                    self.end(host, name, args)
+                yield row
+
+        return timedgenerator
+
+    # Start of a call, the calls in progress of each thread are on its stack.
+    # The phases are reported in the order they are first called.
+    def begin(self, host, name):
+
+        if self.mode and (host, name) not in self.phases:
+            self.lock.acquire()
+            try:
+                if (host, name) not in self.phases:
+                    self.phases[(host, name)] = [0, 0.0, 0.0]
+                    self.order.append((host, name))
+            finally:
+                self.lock.release()
+
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        stack.append([time.time(), 0.0])
+
+    # End of the call, the time of the call is taken out of the self time of the call that called it.
+    def end(self, host, name, args):
+
+        ended = time.time()
+        started, children = self.local.stack.pop()
+        elapsed = ended - started
+        if self.local.stack:
+            self.local.stack[-1][1] += elapsed
+
+        if self.mode:
+            self.lock.acquire()
+            try:
+                phase = self.phases[(host, name)]
+                phase[0] += 1
+                phase[1] += elapsed
+                phase[2] += elapsed - children
+            finally:
+                self.lock.release()
+
+        if name in globalVariable.tracephases:
+            self.record(host, name, started, ended, args)
+
+    # Keep the event of the stage run from the started to the ended time, along with the segment it was for
+    # ( if one of the arguments is the information of the segment ). On the main host the stages of the host
+    # are on the track of the host, the rest of them on the track of the process that ran them.
+    def record(self, host, name, started, ended, args=()):
+
+        if not self.trace:
+            return
+
+        details = {}
+        for arg in args:
+            if isinstance(arg, dict) and 'dbid' in arg and 'content' in arg:
+                details = {
+                    'dbid': arg['dbid'],
+                    'content': arg['content']
+                }
+                break
+
+        if host == self.host:
+            track = "{0} process {1}".format(self.host, os.getpid())
+        else:
+            track = "{0} ssh to the host".format(self.host)
+
+        self.lock.acquire()
+        try:
+            self.events.append([host, track, name, started, ended, details])
+        finally:
+            self.lock.release()
+
+    # On a new worker process, start with no phases of the process it was started from.
+    def reset(self):
+        self.phases = {}
+        self.order = []
+        self.events = []
+        self.local = threading.local()
+
+    # The phases timed and the events of the worker process ( and start over ), nothing if we are not a
+    # worker process since the phases are already here.
+    def collect(self):
+
+        if not (self.mode or self.trace) or os.getpid() == self.pid:
+            return None
+
+        phases = [(key, self.phases[key]) for key in self.order]
+        events = self.events
+        self.reset()
+        return phases, events
+
+    # Add the phases timed and the events of a worker process
+    def merge(self, collected):
+
+        if not collected:
+            return
+
+        phases, events = collected
+        self.lock.acquire()
+        try:
+            self.events.extend(events)
+            for key, timing in phases:
+                phase = self.phases.get(key)
+                if phase is None:
+                    phase = self.phases[key] = [0, 0.0, 0.0]
+                    self.order.append(key)
+                for i in range(3):
+                    phase[i] += timing[i]
+        finally:
+            self.lock.release()
+
+    # The phases timed for the host, name with the number of calls, time and self time of each phase.
+    def timings(self, host):
+        return [[name] + self.phases[(h, name)] for h, name in self.order if h == host]
+
+    # The peak memory (MB) of the program on this host, including the worker processes that have finished.
+    def peakrss(self):
+        return max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        ) / 1024.0
+
+    # When the cprofile is asked for, run the function under the cProfile and save the stats on the statsfile.
+    # Functions called by a function already run under the cProfile are part of its stats, unless its a
+    # worker process then the worker has its own stats.
+    def runcall(self, statsfile, function, *args):
+
+        if self.mode != 'cprofile' or getattr(self.local, 'profiling', None) == os.getpid():
+            return function(*args)
+
+        self.local.profiling = os.getpid()
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(function, *args)
+        finally:
+            self.local.profiling = None
+            profile.dump_stats(statsfile)
+
+    # Save the phases and the events of the host on the file, to be sent back with the logs.
+    def save(self, file):
+
+        if not self.mode and not self.trace:
+            return
 
-            # And read all the data from the json file
-            data = json.load(f)
+        with open(file, "w") as f:
+            json.dump({
+                'host': self.host,
+                'peakrss': self.peakrss(),
+                'phases': self.timings(self.host),
+                'events': self.events
+            }, f)
 
-            # And then update the new data we just received
-            data.update(appenddata)
 
-    # If its the first time then the file would not exists and we will end
-    # up with the error, here we ensure that we use that error to create the
-    # the file and add the content
+# The phases of the program timed when the profile is asked for
+Profiler = PhaseProfiler()
+
+
+# Function: HostPipe(command, host, data)
+# Run the command for the host with the data sent on its stdin, the stderr of the command is written
+# on the screen, each line prefixed with the host, so that the output is readable when the program is run
+# on many hosts at the same time, and the stdout is returned. Raises CalledProcessError if the command fails.
+def HostPipe(command, host, data):
+
+    process = subprocess.Popen(
+            command,
+            shell=True,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+    )
+
+    # The stderr is written on the screen while we send the data and read the stdout.
+    def printer():
+        for line in iter(process.stderr.readline, ''):
+            OutputLock.acquire()
+            try:
+                sys.stdout.write("[{0}] {1}\n".format(host, line.rstrip('\r\n')))
+                sys.stdout.flush()
+            finally:
+                OutputLock.release()
+
+    t = threading.Thread(target=printer)
+    t.setDaemon(True)
+    t.start()
+
+    # If the command dies before reading the data, we will know it from the return code.
+    try:
+        process.stdin.write(data)
+        process.stdin.close()
     except IOError:
-        data = appenddata
+        pass
+
+    output = process.stdout.read()
+    returncode = process.wait()
+    t.join()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command)
+
+    return output
+
+
+# Function: PayloadWriter(out, files)
+# Write the files on the out as a single payload, the marker with the number of files
+# followed by the name and size of each file and its contents.
+def PayloadWriter(out, files):
+
+    out.write("{0} {1}\n".format(globalVariable.payloadmarker, len(files)))
+    for file in files:
+        with open(file, "rb") as infile:
+            data = infile.read()
+        out.write("{0} {1}\n".format(os.path.basename(file), len(data)))
+        out.write(data)
+    out.flush()
+
+
+# Function: PayloadReader(output)
+# Read the files from the payload written by the PayloadWriter, returns the text before the payload
+# and the list of name and contents of the files, the list is None if there is no payload.
+def PayloadReader(output):
+
+    # Where does the payload start
+    start = output.find(globalVariable.payloadmarker + " ")
+    if start == -1:
+        return output, None
+    text = output[:start]
+
+    files = []
+    end = output.index("\n", start)
+    count = int(output[start:end].split(" ")[1])
+    for i in range(count):
+        start = end + 1
+        end = output.index("\n", start)
+        name, size = output[start:end].rsplit(" ", 1)
+        files.append((os.path.basename(name), output[end + 1:end + 1 + int(size)]))
+        end = end + int(size)
+
+    return text, files
+
+
+# Function: SshControlSetup()
+# Create the private directory for the control sockets of the ssh master connections, from now on
+# all the ssh / scp to a host goes through the master connection of the host if there is one.
+# The master connections are closed when the program exits.
+def SshControlSetup():
+
+    globalVariable.sshcontroldir = tempfile.mkdtemp(prefix='ssh_' + __file__ + '_')
+    globalVariable.sshoptions = ' -o ControlMaster=no -o ControlPath=' + \
+                                os.path.join(globalVariable.sshcontroldir, '%r@%h:%p')
+    logger.debug("Control directory for the ssh master connections: \"{0}\"".format(
+        globalVariable.sshcontroldir
+    ))
+
+    atexit.register(SshControlTeardown)
 
-    # Right, so now we have the data lets write them up to the file
-    with open(jsondatafile, 'w') as outfile:
-        json.dump(data, outfile, indent=4)
 
+# Function: SshMaster(host)
+# Open the ssh master connection to the host in the background, if we fail to open it
+# the ssh / scp to the host makes its own connection as before.
+def SshMaster(host):
 
-# Function: RemoveTempdir(host, tempdir)
-# This function removes the temp work directory on all the host
-# of the hostmap.
-def RemoveTempdir(host, tempdir):
+    # Local Variables.
+    controlpath = os.path.join(globalVariable.sshcontroldir, '%r@%h:%p')
 
-    logger.debug("Removing old work directory: \"{0}\" if exists on host: \"{1}\"".format(
-        tempdir,
+    logger.debug("Opening the ssh master connection to the host: \"{0}\"".format(
         host
     ))
 
-    # Check if there temp directory already on the host, if yes remove them
+    devnull = open(os.devnull, 'w')
     try:
-        subprocess.check_call(
-                'ssh -qtt %s \"if [ -d %s ]; then rm -rf %s; fi\"' %
+        returncode = subprocess.call(
+                'ssh -o ControlMaster=yes -o ControlPath=%s -fnNT %s' %
                 (
-                    host,
-                    tempdir,
-                    tempdir
+                    controlpath,
+                    host
                 ),
-                shell=True
+                shell=True,
+                stdout=devnull,
+                stderr=devnull
         )
+    finally:
+        devnull.close()
 
-    # Error out on case we receive any error like permission issue etc..
-    except subprocess.CalledProcessError, e:
-        err = 'Error when trying to remove the old directory from %s:%s' % (host, tempdir)
-        print >> sys.stderr, err
-        sys.exit(1)
+    if returncode != 0:
+        logger.warn("Unable to open the ssh master connection to the host: \"{0}\", "
+                    "continuing without it".format(
+            host
+        ))
+    else:
+        globalVariable.sshmasters.append(host)
 
 
-# Function: CreateTempdir(host)
-# This function creates a temp work directory on all the host
-# of the hostmap.
-def CreateTempdir(host):
+# Function: SshControlTeardown()
+# Close all the ssh master connection and remove the control directory.
+def SshControlTeardown():
 
     # Local Variables.
-    tempdir = globalVariable.tempdir
+    controlpath = os.path.join(globalVariable.sshcontroldir, '%r@%h:%p')
 
-    logger.debug("Received information to build working directory: \"{0}\" on host: \"{1}\"".format(
-        tempdir,
-        host
-    ))
+    devnull = open(os.devnull, 'w')
+    try:
+        for host in globalVariable.sshmasters:
+            logger.debug("Closing the ssh master connection to the host: \"{0}\"".format(
+                host
+            ))
+            subprocess.call(
+                    'ssh -o ControlPath=%s -O exit %s' %
+                    (
+                        controlpath,
+                        host
+                    ),
+                    shell=True,
+                    stdout=devnull,
+                    stderr=devnull
+            )
+    finally:
+        devnull.close()
+
+    globalVariable.sshmasters = []
+    shutil.rmtree(globalVariable.sshcontroldir, True)
+
+
+# Class: SshTransport()
+# How the program reaches the hosts, the transport gives the command line that runs a command on the host
+# ( command ) or the program on the host with the environment ( launch ), the command line is then run by
+# HostPipe / subprocess on the main host. The ssh transport runs them over the ssh master connection of the host.
+class SshTransport():
+    def __init__(self):
+        self.name = 'ssh'
+
+    # Before reaching any of the hosts
+    def setup(self):
+        SshControlSetup()
 
-    # Lets remove any pre-created directory so that we start in fresh
-    # This step is great if we have created some files earlier and the script
-    # didn't clean it up due to the failure of the script.
-    # if we don't clean it up then there would be duplicate data
-    RemoveTempdir(
+    # Before launching the program on the host
+    def connect(self, host):
+        SshMaster(host)
+
+    # The command line to run the command on the host
+    def command(self, host, command):
+        return "ssh%s %s \"%s\"" % (
+            globalVariable.sshoptions,
             host,
-            tempdir
-    )
+            command
+        )
 
-    logger.debug("Creating work directory: \"{0}\" on host: \"{1}\"".format(
-        tempdir,
-        host
-    ))
+    # The command line to run the program on the host, the program is read from the stdin by the bootstrap.
+    # If we have GPHOME set we'll use its python on the host otherwise whatever is current in the shell.
+    def launch(self, host, environment):
 
-    # Since we have removed the directory we will need to create it.
-    # The point of the blank file (with dbid=0) is to ensure the scp doesn't fail since the
-    # segment didn't provide any data , this file does not harm since there is no data.
-    try:
-        subprocess.check_call(
-                'ssh -qtt %s \"mkdir -p %s; touch %s/0_%s_%s.log\"' %
-                (
-                    host,
-                    tempdir,
-                    tempdir,
-                    host,
-                    __file__
-                ),
-                shell=True
+        py_string = os.getenv('GPHOME', '')
+        if py_string:
+            py_string = 'source ' + os.path.join(py_string, 'greenplum_path.sh') + '; '
+
+        return "ssh%s -T %s \"%s %spython -c '%s' \"" % (
+            globalVariable.sshoptions,
+            host,
+            py_string,
+            "".join(["export %s=%s; " % (name, pipes.quote(str(value))) for name, value in environment]),
+            globalVariable.bootstraploader
         )
 
-    # Error if we encounter permission issue or such during creation
-    except subprocess.CalledProcessError, e:
-        err = 'Error when trying to remove the old files from %s:%s' % (host, tempdir)
-        print >> sys.stderr, err
-        sys.exit(1)
+
+# Class: LocalTransport(delays)
+# The transport that runs each host as a process on this host, with a work directory for each host
+# ( its HOME & TMPDIR, so each host has its own checkpoints and work directory ). The command for the host
+# starts after the delay (seconds) of the host, or the default delay ( host '' ), to act like a slow host or ssh.
+# This lets the launch of the program on many hosts be tested or benchmarked without a cluster.
+class LocalTransport():
+    def __init__(self, delays):
+        self.name = 'local'
+        self.delays = delays
+        self.rootdir = None
+
+    # The work directories of the hosts are removed when the program exits
+    def setup(self):
+        self.rootdir = tempfile.mkdtemp(prefix='local_' + __file__ + '_')
+        logger.debug("Work directory of the local hosts: \"{0}\"".format(
+            self.rootdir
+        ))
+        atexit.register(shutil.rmtree, self.rootdir, True)
+
+    # The work directory of the host
+    def connect(self, host):
+        hostdir = self.hostdir(host)
+        if not os.path.exists(hostdir):
+            os.makedirs(hostdir)
+
+    def hostdir(self, host):
+        return os.path.join(self.rootdir, host)
+
+    # The command line to run the command in the work directory of the host, after the delay of the host
+    def command(self, host, command):
+
+        delay = self.delays.get(host, self.delays.get('', 0))
+        hostdir = pipes.quote(self.hostdir(host))
+
+        text = "mkdir -p {0} && cd {0} && export HOME={0} TMPDIR={0} && {1}".format(
+            hostdir,
+            command
+        )
+        if delay:
+            text = "sleep {0} && {1}".format(delay, text)
+        return text
+
+    # The command line to run the program as the host with the python of this program.
+    def launch(self, host, environment):
+
+        return self.command(host, "%s%s -c '%s'" % (
+            "".join(["export %s=%s; " % (name, pipes.quote(str(value))) for name, value in environment]),
+            pipes.quote(sys.executable),
+            globalVariable.bootstraploader
+        ))
+
+
+# The transport to the hosts, ssh unless asked for otherwise by the TransportSetup
+Transport = SshTransport()
+
+
+# Function: TransportSetup(transport, delays)
+# Use the transport asked for to reach the hosts, and set it up.
+def TransportSetup(transport, delays):
+
+    global Transport
+
+    if transport == 'local':
+        Transport = LocalTransport(delays)
+
+    logger.info("Reaching the hosts using the transport: \"{0}\"".format(
+        Transport.name
+    ))
+    Transport.setup()
 
 
 # Function : OutputFileMerger()
@@ -393,9 +1064,9 @@ def OutputFileMerger():
     # Get the Master logfile.
     # The first content of the merged output file
     # should be from the master, so we begin by first reading and merging the master contents
-    if ids[1] == 1:
+    if 1 in ids:
         logger.debug("Merging the contents of master segment(dbid): \"{0}\"".format(
-            ids[0]
+            1
         ))
         file = "{0}/1_*_{1}.log".format(WrkDir, __file__)
         read_files = glob.glob(file)
@@ -446,55 +1117,472 @@ def OutputFileMerger():
     return OutputFileName
 
 
-# Function : InputFileMerger(path, file, StartTime, EndTime)
-# The idea behind this function is to merge all the content into a single file
-# This helps in reducing the complexity of the code, we choose the same path as the logfile
-# Since we assume the directory were the logfiles are should have enough space to accommodate this file.
-def InputFileMerger(path, file, StartTime, EndTime):
+# Function : RecordFileMerger(outputformat, StartTime, EndTime)
+# This function merge the records from all the hosts to a single json / csv file
+# along side the output file, the records of the hosts are removed once merged.
+def RecordFileMerger(outputformat, StartTime, EndTime):
+
+    logger.info("Merging all the summary records from all hosts onto a single file")
+
+    # Local Variables
+    WrkDir = os.path.dirname(os.path.realpath(__file__))
+    RecordFileName = os.path.splitext(globalVariable.OutputFile)[0] + "." + outputformat
+    columns = globalVariable.recordcolumns
+    records = []
+
+    # Read the records of all the hosts
+    read_files = sorted(glob.glob("{0}/*_{1}.records".format(WrkDir, __file__)))
+    for f in read_files:
+        logger.debug("Merging the records of the file: \"{0}\"".format(
+            f
+        ))
+        with open(f, "rb") as infile:
+            for line in infile:
+                if line.strip():
+                    records.append(json.loads(line))
+
+    # Like the output file, the records of the master are at the start of the file
+    records.sort(key=lambda x: x['dbid'] != '1')
+
+    if outputformat == 'json':
+        with open(RecordFileName, "w") as outfile:
+            json.dump({
+                'StartTime': StartTime,
+                'EndTime': EndTime,
+                'sizeunit': 'bytes',
+                'records': records
+            }, outfile, indent=1)
+
+    else:
+        with open(RecordFileName, "wb") as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(columns)
+            for record in records:
+                row = []
+                for column in columns:
+                    value = record.get(column, '')
+                    if isinstance(value, unicode):
+                        value = value.encode('utf-8')
+                    row.append(value)
+                writer.writerow(row)
+
+    for f in read_files:
+        os.remove(f)
+
+    # Return the record file name.
+    return RecordFileName
+
+
+# Function: LogRowAt(infile, offset)
+# Find the first row (i.e line that starts with the timestamp) at or after the offset of the file
+# Returns the offset where the row starts and the timestamp of the row, the timestamp is None if there is
+# no row after the offset.
+def LogRowAt(infile, offset):
+
+    # Unless we are at the start of the file, we are most likely in the middle of a line
+    # so lets skip to the start of the next line.
+    if offset == 0:
+        infile.seek(0)
+    else:
+        infile.seek(offset - 1)
+        infile.readline()
+
+    # Skip the continuation lines of the multi line statement till we reach the start of the row.
+    while True:
+        offset = infile.tell()
+        line = infile.readline()
+        if not line:
+            return offset, None
+        if globalVariable.row_start.match(line):
+            return offset, line[0:19]
+
+
+# Function: LogFileSeek(infile, StartTime)
+# The logfile are written in the order of time, so rather than reading the whole logfile
+# we binary search the file by the offset to find the first row that was logged at or after the start time.
+# Returns the offset of that row.
+def LogFileSeek(infile, StartTime):
+
+    # The size of the file
+    infile.seek(0, 2)
+    low = 0
+    high = infile.tell()
+
+    # Narrow down to the offset where the first row at or after the start time begins
+    while low < high:
+        middle = (low + high) // 2
+        timestamp = LogRowAt(infile, middle)[1]
+        if timestamp is None or timestamp >= StartTime:
+            high = middle
+        else:
+            low = middle + 1
+
+    return LogRowAt(infile, low)[0]
+
+
+# Function : LogWindowReader(infile, StartTime, EndTime, seekable, position, limit)
+# Generator that returns the rows of the logfile that were logged between the start time and the end time
+# Each row is returned as a whole, i.e along with the continuation lines of a multi line statement.
+# The offset on the position is where the logfile is read till, if its set to start with we continue from there.
+# If there is a limit, we stop at the first row that starts at or after that offset.
+def LogWindowReader(infile, StartTime, EndTime, seekable=True, position=None, limit=None):
+
+    # Local Variable
+    match = globalVariable.row_start.match
+
+    if position is None:
+        position = {'offset': None}
+    if limit is None:
+        limit = float('inf')
+
+    # Continue from the row where we stopped the last time.
+    if position['offset'] is not None:
+        infile.seek(position['offset'])
+
+    # Jump straight to the first row of the start time, if we can't seek on the logfile
+    # ( i.e compressed logfile ) we read from the start of the logfile till we reach the start time.
+    elif seekable:
+        position['offset'] = LogFileSeek(infile, StartTime)
+        infile.seek(position['offset'])
+
+    else:
+        position['offset'] = 0
+
+    # The lines of the row read so far and should the row be returned, this is decided at the start
+    # of the row and the rest of the lines of the row follows it.
+    offset = position['offset']
+    record = ''
+    keep = False
+
+    for line in infile:
+        if match(line):
+
+            # The row before this one is complete
+            offset += len(record)
+            if keep:
+                position['offset'] = offset
+                yield record
+            record = ''
+            keep = False
+
+            # Once we are past the end time ( or the limit ), there is nothing more for us in the logfile.
+            date = line[0:19]
+            if date > EndTime or offset >= limit:
+                break
+
+            keep = date >= StartTime
+
+        record += line
+
+    # The last row of the logfile
+    position['offset'] = offset + len(record)
+    if keep:
+        yield record
+
+
+# Function : LogRecordFilter(records)
+# Generator that returns only the rows the readers have use for, i.e the duration rows, the LOCK TABLE rows
+# and the gp_dump_agent command line rows. The check is on the text of the row, so the rest of the rows
+# ( mostly the statement rows ) are never split into the columns by the csv reader.
+def LogRecordFilter(records):
+
+    # Local Variable
+    duration, lock, dumpagent = globalVariable.row_filter
+
+    for record in records:
+        if duration in record or lock in record or dumpagent in record:
+            yield record
+
+
+# Function : LogMmapReader(buf, infile, StartTime, EndTime, position)
+# Generator that returns the same rows as the LogRecordFilter on the LogWindowReader, for the logfile mapped on the buf.
+# The window is gone through in slices, a slice that has none of the text the readers look for is skipped
+# without reading its lines, so only the part of the logfile with the rows the readers need is read.
+def LogMmapReader(buf, infile, StartTime, EndTime, position):
+
+    # Local Variable
+    tokens = globalVariable.row_filter
+    size = globalVariable.logslice
+
+    try:
+
+        # The rows of the window are from the first row at or after the start time till the
+        # first row after the end time, unless we continue from where we stopped the last time.
+        if position['offset'] is None:
+            position['offset'] = LogFileSeek(infile, StartTime)
+        pos = position['offset']
+        end = min(LogFileSeek(infile, EndTime + '\0'), len(buf))
+
+        while pos < end:
+
+            # The slice ends where the row after the slice size starts
+            stop = min(LogRowAt(infile, pos + size)[0], end)
+
+            # Nothing the readers have use for on the slice, lets skip it.
+            for token in tokens:
+                if buf.find(token, pos, stop) != -1:
+                    break
+            else:
+                position['offset'] = pos = stop
+                continue
+
+            # Else lets read the rows of the slice
+            position['offset'] = pos
+            for record in LogRecordFilter(LogWindowReader(infile, StartTime, EndTime, True, position, stop)):
+                yield record
+            pos = stop
+
+    finally:
+        buf.close()
+
+
+# Function : LogRecordReader(infile, StartTime, EndTime, seekable, position)
+# Returns the rows of the logfile between the start time and the end time that the readers have use for
+# ( see LogRecordFilter ). The plain logfiles are mapped to the memory and searched by the LogMmapReader,
+# the compressed ones ( or if the logfile can't be mapped ) are read line by line by the LogWindowReader.
+def LogRecordReader(infile, StartTime, EndTime, seekable=True, position=None):
+
+    if position is None:
+        position = {'offset': None}
+
+    if seekable:
+        try:
+            buf = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+            return LogMmapReader(buf, infile, StartTime, EndTime, position)
+
+        # The logfile is empty or the filesystem doesn't allow it.
+        except (mmap.error, ValueError):
+            logger.debug("Can't map the logfile to the memory, reading it line by line")
+
+    return LogRecordFilter(LogWindowReader(infile, StartTime, EndTime, seekable, position))
+
+
+# Function: LogFileOpen(logfile)
+# Open the logfile for reading, the logfiles compressed by the log rotation (.gz / .bz2) are
+# decompressed as they are read, so nothing is inflated to the disk.
+# Returns the file and if we can seek on it.
+def LogFileOpen(logfile):
+
+    if logfile.endswith('.gz'):
+        logger.debug("The logfile: \"{0}\" is gzip compressed".format(
+            logfile
+        ))
+        return gzip.GzipFile(logfile, 'rb'), False
+
+    elif logfile.endswith('.bz2'):
+        logger.debug("The logfile: \"{0}\" is bzip2 compressed".format(
+            logfile
+        ))
+        return bz2.BZ2File(logfile, 'rb'), False
+
+    return open(logfile, 'rb'), True
+
+
+# Function : InputFileMerger(logfiles, StartTime, EndTime, checkpoint)
+# The idea behind this function is to merge all the content of the logfiles into a single stream of rows
+# This helps in reducing the complexity of the code, the readers work on the rows without worrying about
+# the logfiles they came from. Nothing is written to the disk, the logfiles are read as the rows are consumed.
+# With a checkpoint, the logfiles are read from where the checkpoint left them and the progress is saved on it.
+def InputFileMerger(logfiles, StartTime, EndTime, checkpoint=None):
 
     # Local variable
-    # The reason why we need this junk is if file has no ending (i.e ends with "statement: "
-    # after we create the inputfile , The script fails so we always ensure that
-    # there is a ending line with this junk data
-    junk = r'2016-04-16 12:10:47.750086 PDT,"gpadmin","template1",p100,th-1335258640,"127.0.0.1","7133",2016-04-16 ' \
-           r'12:10:47 PDT,44752,con540,cmd27,seg-1,,,x44752,sx1,"LOG","00000","statement:",,,,,,,,,,," ' \
-           r'SELECT typname, typlen FROM pg_type WHERE oid=19",,,,,,"SELECT typname, typlen FROM pg_type ' \
-           r'WHERE oid=19",0,,"postgres.c",1618,'
-
-    logger.debug("Received call to filter the logfile: \"{0}\" from \"{1}\" to \"{2}\"".format(
-            file,
+    pQuery = globalVariable.row_query
+    rows = 0
+
+    # Read the content of the logfile and return only those rows of data
+    # that starts and ends with the start time and end time respectively
+    # we could have put in duration to reduce the rows even
+    # further, but if we do that we will loose the information to get the
+    # dump file name and we can't report the dump file size.
+    for file in logfiles:
+
+        logger.debug("Received call to filter the logfile: \"{0}\" from \"{1}\" to \"{2}\"".format(
+                file,
+                StartTime,
+                EndTime
+                ))
+
+        for f in glob.glob(file):
+
+            # The logfile was read completely before the checkpoint, nothing more to read here
+            position = {'offset': None}
+            if checkpoint:
+                if checkpoint.done(f):
+                    logger.debug("The logfile: \"{0}\" was read completely as per the checkpoint".format(
+                        f
+                    ))
+                    continue
+                position['offset'] = checkpoint.offset(f)
+
+            infile, seekable = LogFileOpen(f)
+            try:
+
+                # Each logfile has its own csv reader, so that if the last row of the logfile is cut short
+                # it doesn't swallow the rows of the next logfile.
+                records = LogRecordReader(infile, StartTime, EndTime, seekable, position)
+                for row in csv.reader(records, delimiter=','):
+
+                    # The readers need all the columns till the query, anything short of that is not a valid row
+                    if len(row) > pQuery:
+                        rows += 1
+                        yield row
+
+                    # We are back here only when the reader is done with the row, so the reader has
+                    # all the information from the logfile till the offset.
+                    if checkpoint:
+                        checkpoint.update(f, position['offset'])
+
+                if checkpoint:
+                    checkpoint.save(f, position['offset'], True)
+
+            # The compressed logfile doesn't support the with statement on python 2.6
+            finally:
+                infile.close()
+
+    # If there is no rows, lets inform the user that you may get no data for that
+    # segment , this can happen due to invalid start time / end time or log_duration is not turned on
+    # if the log_duration not ON then segment don't log much information as most queries are run on the
+    # master.
+    if rows == 0 and not (checkpoint and checkpoint.resumed):
+        logger.warn("There seems no contents on the logfile: \"{0}\" between \"{1}\" and \"{2}\"".format(
+            ",".join(logfiles),
             StartTime,
             EndTime
+        ))
+
+
+# Class: LogCheckpoint(segInfo, StartTime, EndTime)
+# The progress of reading the logfiles of the segment, i.e how far each logfile was read and the information
+# gathered by the reader till there ( the state ), is saved once in a while on the checkpoint directory of the host.
+# When the program is run again with the same start time and end time, the reader continues from the checkpoint
+# provided none of the logfiles (path, inode, size, mtime) has changed since.
+# The checkpoint is kept by dbid and start time / end time, so the runs of different windows don't
+# overwrite each other's checkpoint, and is removed once the report of the segment is written.
+class LogCheckpoint():
+    def __init__(self, segInfo, StartTime, EndTime):
+        self.window = (StartTime, EndTime)
+        self.filename = os.path.join(globalVariable.checkpointdir, "checkpoint_{0}_{1}".format(
+            segInfo['dbid'],
+            hashlib.md5(repr(self.window)).hexdigest()[:16]
+        ))
+        self.state = {}
+        self.resumed = False
+        self.rows = 0
+        self.saved = time.time()
+
+        # The logfiles of the segment, how far they were read and if they were read completely
+        self.logfiles = {}
+        for file in segInfo['logfiles']:
+            for f in glob.glob(file):
+                self.logfiles[f] = {
+                    'identity': self.identity(f),
+                    'offset': None,
+                    'done': False
+                }
+
+    # What tells us the logfile is the same one we had read before.
+    def identity(self, logfile):
+        stat = os.stat(logfile)
+        return stat.st_ino, stat.st_size, stat.st_mtime
+
+    # The identity of all the logfiles.
+    def identities(self, logfiles):
+        return sorted([(f, logfiles[f]['identity']) for f in logfiles])
+
+    # Continue from the checkpoint saved on the earlier run, if there is one for the same logfiles.
+    def load(self):
+
+        try:
+            with open(self.filename, "rb") as f:
+                checkpoint = cPickle.load(f)
+
+        # No checkpoint or it's not complete, lets start from the start.
+        except IOError:
+            return
+        except Exception, e:
+            logger.warn("Ignoring the checkpoint: \"{0}\" that can't be read: \"{1}\"".format(
+                self.filename,
+                e
+            ))
+            return
+
+        if checkpoint['window'] != self.window or \
+                self.identities(checkpoint['logfiles']) != self.identities(self.logfiles):
+            logger.info("The checkpoint: \"{0}\" is of some other start time / end time or logfiles, "
+                        "reading the logfiles from the start".format(
+                self.filename
             ))
+            return
+
+        self.logfiles = checkpoint['logfiles']
+        self.state = checkpoint['state']
+        self.resumed = True
+        logger.info("Continuing from the checkpoint: \"{0}\", \"{1}\" of \"{2}\" logfiles are read completely".format(
+            self.filename,
+            len([f for f in self.logfiles if self.logfiles[f]['done']]),
+            len(self.logfiles)
+        ))
 
-    # Get the input file + path
-    InputFile = path + "/" + globalVariable.InputFile
+    # The offset to continue the logfile from, None if we have not read it.
+    def offset(self, logfile):
+        return self.logfiles[logfile]['offset']
 
-    # Read the content of the logfile and append only those rows of data
-    # that starts and ends with the start time and end time respectively
-    # we could have put in duration to reduce the size of the file even
-    # further, but if we do that we will loose the information to get the
-    # dump file name and we can't report the dump file size.
-    read_files = glob.glob(file)
-    with open(InputFile, "a") as outfile:
-        for f in read_files:
-            with open(f, "rb") as infile:
-                    for row in infile.readlines():
-                        if row[0:19] >= StartTime and row[0:19] <= EndTime:
+    # Was the logfile read completely.
+    def done(self, logfile):
+        return self.logfiles[logfile]['done']
+
+    # The reader has all the information from the logfile till the offset, save it if its time.
+    def update(self, logfile, offset):
+        self.rows += 1
+        if self.rows % globalVariable.checkpointrows == 0 and \
+                time.time() - self.saved >= globalVariable.checkpointinterval:
+            self.save(logfile, offset)
+
+    # Save the progress, the checkpoint is written on a temporary file and renamed
+    # so that we never leave behind a checkpoint that is cut short.
+    def save(self, logfile, offset, done=False):
+
+        self.logfiles[logfile]['offset'] = offset
+        self.logfiles[logfile]['done'] = done
+        self.saved = time.time()
+
+        checkpoint = {
+            'window': self.window,
+            'logfiles': self.logfiles,
+            'state': self.state
+        }
+
+        try:
+            if not os.path.exists(globalVariable.checkpointdir):
+                os.makedirs(globalVariable.checkpointdir, 0700)
+            with open(self.filename + ".tmp", "wb") as f:
+                cPickle.dump(checkpoint, f, cPickle.HIGHEST_PROTOCOL)
+            os.rename(self.filename + ".tmp", self.filename)
+            logger.debug("Saved the checkpoint: \"{0}\" at offset \"{1}\" of the logfile: \"{2}\"".format(
+                self.filename,
+                offset,
+                logfile
+            ))
+
+        # Not being able to save the progress is not a reason to stop reading the logs.
+        except (IOError, OSError), e:
+            logger.warn("Can't save the checkpoint: \"{0}\": \"{1}\"".format(
+                self.filename,
+                e
+            ))
 
-                            # There is a issue when the SQL statement is on the next line
-                            # the script fails since there is no ending, so we place rest of the terminator to avoid
-                            # IndexError related errors.
-                            # Moreover we don't care for the statement line in the script since the calculation are done
-                            # on the duration line, so it doesnt matter for the remaining scripts
-                            row = row.replace('statement: \n','statement:",,,,,,,,,,,",\n')
-                            outfile.write(row)
+    # The logfiles are read and reported, there is nothing to continue from anymore.
+    def remove(self):
 
-                    # # End the inputfile with a junk data, so that we ensure always there is a ending..
-                    outfile.write(junk)
+        try:
+            os.remove(self.filename)
+            logger.debug("Removed the checkpoint: \"{0}\"".format(
+                self.filename
+            ))
 
-    # Return the name of the inputfile which has the content
-    return InputFile
+        # There was no checkpoint saved, the logfiles were read before it was time to save one.
+        except OSError:
+            pass
 
 
 # Function: HostmapStrip(hostmap)
@@ -520,59 +1608,68 @@ def StripHostmap(hostmap):
         sys.exit(2)
 
 
-# Function: ddboost_dump_size(dumpfile)
-# Get the size of the dump using the gpmfr command.
-def ddboost_dump_size(dumpfile, post_data):
+# Function: ddboost_listing(timestamp)
+# Get the listing of the files of the backup timestamp using the gpmfr command.
+# Returns the size of the files by the name of the file.
+def ddboost_listing(timestamp):
 
-    # Timestamp of the dump
-    timestamp = dumpfile.split('gp_dump')[1].split('_')[3].split('.')[0]
-    logger.debug("Timestamp for the backup: \"{0}\"".format(timestamp))
-
-    # if the user has used prefix in his backup, the ddboost doesnt support it
-    # so we make the necessary changes here.
-    dumpfile = 'gp_dump' + dumpfile.split('gp_dump')[1]
-    logger.debug("Dumpfile name for the backup: \"{0}\"".format(dumpfile))
+    # Local Variables
+    sizes = {}
 
-    # Command to extract the dump size
-    if post_data == 'Y':
-        command = 'gpmfr --list-file ' + timestamp + '| grep \'' + dumpfile + '\' | grep post_data'
-    else:
-        command = 'gpmfr --list-file ' + timestamp + '| grep \'' + dumpfile + '\' | grep -v post_data'
-    logger.debug("Dumpfile extraction command for the backup: \"{0}\"".format(command))
+    # Command to list the files of the backup
+    command = 'gpmfr --list-file ' + timestamp
+    logger.debug("Dumpfile listing command for the backup: \"{0}\"".format(command))
 
     # Execute the command
-    sizecommand = subprocess.Popen(
+    listcommand = subprocess.Popen(
             command,
             shell=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE
     )
 
-    # The size of the dump is
-    try:
-        size = int(sizecommand.stdout.read().split("\t")[3].split("\n")[0])
-        logger.debug("The size of the backup: \"{0}\"".format(size))
+    # The size of the file is on the fourth column of the listing, if the user has used prefix
+    # in his backup, the ddboost doesnt support it so we keep the name of the file from gp_dump.
+    for line in listcommand.communicate()[0].split("\n"):
+        columns = line.split("\t")
+        try:
+            size = int(columns[3])
+        except (IndexError, ValueError):
+            continue
+        for column in columns:
+            if 'gp_dump' in column:
+                sizes['gp_dump' + os.path.basename(column.strip()).split('gp_dump', 1)[1]] = size
+
+    logger.debug("Received the size of \"{0}\" files for the backup: \"{1}\"".format(
+        len(sizes),
+        timestamp
+    ))
 
-    # If there is a exception
-    except IndexError:
-        logger.warn("Received exception in getting the size of the dump, setting the size of the dump to Zero")
-        size = 0
+    return sizes
 
-    # return the size
-    return size
 
+# Function: ddboost_timestamp(dumpfile)
+# Timestamp of the backup from the name of the dump on the ddboost
+def ddboost_timestamp(dumpfile):
+    return dumpfile.split('gp_dump')[1].split('_')[3].split('.')[0]
 
-# Function: DumpSize(dumplocation)
-# Function to get the size of the dump
-def DumpSize(dumplocation):
+
+# Function: ddboost_dump_size(dumpfile, sizes)
+# Get the size of the dump from the listing of the backup.
+def ddboost_dump_size(dumpfile, sizes):
+
+    # if the user has used prefix in his backup, the ddboost doesnt support it
+    # so we make the necessary changes here.
+    dumpfile = 'gp_dump' + dumpfile.split('gp_dump')[1]
+    logger.debug("Dumpfile name for the backup: \"{0}\"".format(dumpfile))
 
     # The size of the dump is
     try:
-        size = os.path.getsize(dumplocation)
+        size = sizes[dumpfile]
         logger.debug("The size of the backup: \"{0}\"".format(size))
 
     # If there is a exception
-    except OSError:
+    except KeyError:
         logger.warn("Received exception in getting the size of the dump, setting the size of the dump to Zero")
         size = 0
 
@@ -580,9 +1677,186 @@ def DumpSize(dumplocation):
     return size
 
 
-# Function: HostmapBuilder(logdates, content)
+# Class: DumpSizeResolver()
+# This class gets the size of the dumps. The size of the dumps on the ddboost is looked up from the
+# gpmfr listing of the backup, the listing is run only once for each backup timestamp. The size of the
+# dumps on the filesystem is obtained only once for each dump by a small pool of threads.
+# All of this is done in the background as soon as we are told about the dump, so that we keep
+# reading the logs while gpmfr / the filesystem does its work.
+class DumpSizeResolver():
+    def __init__(self):
+        self.listings = {}
+        self.stats = {}
+        self.statqueue = Queue.Queue()
+        self.statthreads = 0
+        self.lock = threading.Lock()
+
+    # Start getting the size of the dump (name, 'gpddboost' | 'filesystem') in the background.
+    def request(self, dumpfile):
+
+        if dumpfile[1] == 'gpddboost':
+            key = ddboost_timestamp(dumpfile[0])
+            known = self.listings
+        else:
+            key = dumpfile[0]
+            known = self.stats
+
+        self.lock.acquire()
+        try:
+            if key in known:
+                return
+            work = {'done': threading.Event(), 'sizes': {}, 'size': 0}
+            known[key] = work
+
+            # Start one more thread for the filesystem unless we already have enough of them
+            startstat = dumpfile[1] != 'gpddboost' and self.statthreads < globalVariable.dumpsizethreads
+            if startstat:
+                self.statthreads += 1
+        finally:
+            self.lock.release()
+
+        if dumpfile[1] == 'gpddboost':
+            logger.debug("Getting the listing of the backup: \"{0}\" from the ddboost".format(
+                key
+            ))
+            t = threading.Thread(target=self.listing, args=(key, work))
+            t.setDaemon(True)
+            t.start()
+
+        else:
+            self.statqueue.put((key, work))
+            if startstat:
+                t = threading.Thread(target=self.stat)
+                t.setDaemon(True)
+                t.start()
+
+    # Get the listing of the backup timestamp, the lookups waiting on the listing are let go even if it fails.
+    def listing(self, timestamp, work):
+        try:
+            work['sizes'] = ddboost_listing(timestamp)
+        finally:
+            work['done'].set()
+
+    # The threads of the pool get the size of the dumps on the filesystem one after the other.
+    def stat(self):
+        while True:
+            dumplocation, work = self.statqueue.get()
+            try:
+                work['size'] = DumpSize(dumplocation)
+            finally:
+                work['done'].set()
+
+    # The size of the dump (name, 'gpddboost' | 'filesystem') in bytes, from what we have obtained.
+    def size(self, dumpfile):
+
+        self.request(dumpfile)
+        if dumpfile[1] == 'gpddboost':
+            work = self.listings[ddboost_timestamp(dumpfile[0])]
+        else:
+            work = self.stats[dumpfile[0]]
+
+        while not work['done'].isSet():
+            work['done'].wait(1)
+
+        if dumpfile[1] == 'gpddboost':
+            return ddboost_dump_size(dumpfile[0], work['sizes'])
+        return work['size']
+
+
+# The size of the dumps found on the logs of the host
+DumpSizes = DumpSizeResolver()
+
+
+# Function: DumpSizeRequest(dumpfile)
+# Let the DumpSizes know about the dump as soon as we find it on the log, so that we have the size of the dump
+# by the time we finish reading the log. On the worker process of the RunProgram the dump is sent to the
+# RunProgram, since it has the DumpSizes for all the segments of the host.
+def DumpSizeRequest(dumpfile):
+
+    if globalVariable.dumpsizequeue is not None:
+        globalVariable.dumpsizequeue.put(dumpfile)
+    else:
+        DumpSizes.request(dumpfile)
+
+
+# Function: DumpSize(dumplocation)
+# Function to get the size of the dump
+def DumpSize(dumplocation):
+
+    # The size of the dump is
+    try:
+        size = os.path.getsize(dumplocation)
+        logger.debug("The size of the backup: \"{0}\"".format(size))
+
+    # If there is a exception
+    except OSError:
+        logger.warn("Received exception in getting the size of the dump, setting the size of the dump to Zero")
+        size = 0
+
+    # return the size
+    return size
+
+
+# Function: HostLogFinder(hosts, locations, logdates, parallel)
+# Search for the logs with the dates provided on all the locations of each host, one command per host
+# and at most parallel hosts at the same time. Returns the logs found by host.
+def HostLogFinder(hosts, locations, logdates, parallel):
+
+    # Local Variables.
+    pending = Queue.Queue()
+    HostLogs = {}
+
+    logger.info("Searching for the logs on {0} host(s), {1} at a time".format(
+        len(hosts),
+        parallel
+    ))
+
+    for host in hosts:
+        pending.put(host)
+
+    # The name of the logs should have any one of the dates provided
+    namefilter = " -o ".join(map(lambda x: "-name '*" + x + "*'", logdates))
+
+    # Each worker picks the next host that is pending, until there are no more hosts.
+    def worker():
+        while True:
+            try:
+                host = pending.get_nowait()
+            except Queue.Empty:
+                return
+
+            logger.debug("Searching for the logs on host: \"{0}\" at location: \"{1}\"".format(
+                host,
+                ",".join(locations[host])
+            ))
+            sshcmd = Transport.command(host, "find " + " ".join(locations[host]) + " \\( " + namefilter + " \\)")
+            logs = subprocess.Popen(
+                    sshcmd,
+                    shell=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE
+            )
+            result = logs.communicate()[0].split("\n")
+            HostLogs[host] = filter(None, result)
+
+    workers = []
+    for i in range(min(parallel, len(hosts))):
+        t = threading.Thread(target=worker)
+        t.setDaemon(True)
+        t.start()
+        workers.append(t)
+
+    # Wait for all the workers to finish, join with timeout so that the Ctrl-C is not blocked.
+    for t in workers:
+        while t.isAlive():
+            t.join(1)
+
+    return HostLogs
+
+
+# Function: HostmapBuilder(logdates, content, parallel)
 # The below function builds the hostmap and write in the same directory from where the script is called
-def HostmapBuilder(logdates, content):
+def HostmapBuilder(logdates, content, parallel):
 
     # Local Variables.
     query = globalVariable.query
@@ -652,36 +1926,42 @@ def HostmapBuilder(logdates, content):
             logger.error("Unable to remove the exiting hostmap file in the current directory")
             sys.exit(2)
 
+    # Split the segment information and group the location of the logs by host, so that
+    # we search for the logs on all the locations of the host with a single ssh to the host.
+    SegInfoReader = map(lambda x: x.split(':'), SegInfoReader)
+    hosts = []
+    locations = {}
+    for InfoSeg in SegInfoReader:
+        if InfoSeg[0] not in locations:
+            hosts.append(InfoSeg[0])
+            locations[InfoSeg[0]] = []
+        if InfoSeg[1] not in locations[InfoSeg[0]]:
+            locations[InfoSeg[0]].append(InfoSeg[1])
+
+    # Search for the logs on all the hosts at the same time
+    HostLogs = HostLogFinder(hosts, locations, logdates, parallel)
+
     # Loop with the segment information obtained
     logger.debug("Attempting to generate the hostmap file")
-    for segmap in SegInfoReader:
+    for InfoSeg in SegInfoReader:
 
-        # Split the content into a list
-        InfoSeg = segmap.split(':')
+        # The location of the logs of this segment
+        location = InfoSeg[1].rstrip('/') + '/'
         mergeResult = []
-        temp = []
 
-        # sub loop to hunt for the logs with those dates provided
+        # sub loop to pick the logs of this segment with those dates provided
         for file in logdates:
-            logger.debug("Searching for the file with: \"{0}\" on host: \"{1}\" at location: \"{2}\"".format(
+            logger.debug("Picking the file with: \"{0}\" on host: \"{1}\" at location: \"{2}\"".format(
                     file,
                     InfoSeg[0],
                     InfoSeg[1]
             ))
-            sshcmd = "ssh " + InfoSeg[0] + " \"find " + InfoSeg[1] + " -name *" + file + "*\""
-            logs = subprocess.Popen(
-                    sshcmd,
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-            )
-            result = logs.stdout.read().split("\n")
-            temp = result
-            mergeResult = mergeResult + temp
-            del mergeResult[-1]
+            result = [log for log in HostLogs.get(InfoSeg[0], [])
+                      if log.startswith(location) and file in os.path.basename(log)]
+            mergeResult = mergeResult + result
 
             # If we don't find any logs produce a warning message to inform the user.
-            if not mergeResult:
+            if not result:
                 logger.warn("Didn't find any logs for date: \"{0}\" on host: \"{1}\" location: {2}".format(
                     file,
                     InfoSeg[0],
@@ -719,6 +1999,275 @@ def HostmapBuilder(logdates, content):
     sys.exit(0)
 
 
+# Class: BackupIndex(logfiles)
+# The backups found on the master logfiles, i.e the timestamp (key) of the backup, the PID that executed the
+# pg_class exclusive lock, when the lock was requested & released, the share lock PID's and the first & last row
+# logged by the backup. The index is saved on the working directory so that the logfiles are read only once,
+# if the last logfile has grown or there are new logfiles since then only whats new is read.
+class BackupIndex():
+    def __init__(self, logfiles):
+        self.filename = globalVariable.backupindexfile
+        self.logfiles = logfiles
+
+        # The logfiles indexed ( path, inode, size, mtime, offset read till ) and the backups found on them
+        self.indexed = []
+        self.backups = []
+
+    # What tells us the logfile is the same one we had indexed before.
+    def identity(self, logfile):
+        stat = os.stat(logfile)
+        return [logfile, stat.st_ino, stat.st_size, stat.st_mtime]
+
+    # Load the index saved before, provided the logfiles are the same except the last one which can grow.
+    def load(self):
+
+        try:
+            with open(self.filename, 'r') as f:
+                index = json.load(f)
+        except IOError:
+            return
+        except ValueError:
+            logger.warn("Ignoring the backup index: \"{0}\" that can't be read".format(
+                self.filename
+            ))
+            return
+
+        indexed = index['logfiles']
+        current = [self.identity(f) for f in self.logfiles[0:len(indexed)]]
+        if len(indexed) > len(current) or \
+                [i[0:4] for i in indexed[0:-1]] != current[0:-1] or \
+                (indexed and (indexed[-1][0:2] != current[-1][0:2] or indexed[-1][2] > current[-1][2])):
+            logger.info("The master logfiles have changed since the backup index: \"{0}\" was built, "
+                        "building it again".format(
+                self.filename
+            ))
+            return
+
+        self.indexed = indexed
+        self.backups = index['backups']
+
+    # Read the logfiles ( or the part of it ) that are not on the index.
+    def update(self):
+
+        for i in range(len(self.logfiles)):
+            logfile = self.logfiles[i]
+            identity = self.identity(logfile)
+
+            # Nothing new on the logfile since we indexed it, else continue from where we stopped.
+            if i < len(self.indexed):
+                if self.indexed[i][0:4] == identity:
+                    continue
+                offset = self.indexed[i][4]
+            else:
+                offset = 0
+
+            logger.info("Finding the backups on the master logfile: \"{0}\" from offset: \"{1}\"".format(
+                logfile,
+                offset
+            ))
+            identity.append(self.read(logfile, offset))
+            self.indexed[i:i + 1] = [identity]
+
+    # Add the backups found on the logfile from the offset, like the readers only the rows with the duration,
+    # LOCK TABLE or gp_dump_agent command line are looked at. Returns the offset of the last row found,
+    # its read again next time since the row may have been cut short by the database writing it.
+    def read(self, logfile, offset):
+
+        pQuery = globalVariable.row_query
+        position = {'offset': offset}
+        last = start = offset
+
+        infile, seekable = LogFileOpen(logfile)
+        try:
+            for row in csv.reader(LogRecordReader(infile, '', '9999-12-31 23:59:59', seekable, position),
+                                  delimiter=','):
+                if len(row) > pQuery:
+                    self.add(row)
+                last, start = start, position['offset']
+        finally:
+            infile.close()
+
+        return last
+
+    # Add the row to the backup it belongs to, reading the same row again doesn't change the backup.
+    def add(self, row):
+
+        # Local Variable
+        date = row[globalVariable.row_date]
+        pid = row[globalVariable.row_pid]
+        query = row[globalVariable.row_query]
+        line = row[globalVariable.row_dumplocation]
+
+        # The backup in progress, i.e the last one found
+        backup = None
+        if self.backups:
+            backup = self.backups[-1]
+
+        # A new backup starts with the pg_class exclusive lock, unless its of the backup in progress
+        # ( i.e the duration row of the lock or the gp_dump_agent command line was logged first )
+        if query == "LOCK TABLE pg_catalog.pg_class IN EXCLUSIVE MODE;":
+            if backup is None or backup['pid'] not in (None, pid) or backup['lockreleased']:
+                backup = self.new(date)
+            backup['pid'] = pid
+            if not backup['lockrequested']:
+                backup['lockrequested'] = date
+
+        # The backup is identified by the timestamp on the gp_dump_agent command line
+        elif line.startswith('gp_dump_agent command line'):
+            key = globalVariable.backupkey.search(line)
+            if key:
+                if backup is None or backup['timestamp'] not in (None, key.group(0)):
+                    backup = self.new(date)
+                backup['timestamp'] = key.group(0)
+                backup['end'] = date
+
+        # The rest of the rows are only of interest if they are by the PID's of the backup in progress
+        if backup is None:
+            return
+
+        # The lock is released on the commit of the exclusive lock PID
+        if query == "COMMIT" and pid == backup['pid']:
+            backup['lockreleased'] = date
+
+        # The share lock PID's are the ones that lock the tables while the backup holds the pg_class lock
+        elif query.startswith('LOCK TABLE') and query.endswith('IN ACCESS SHARE MODE') and \
+                backup['pid'] and not backup['lockreleased'] and pid not in backup['sharelockpid']:
+            backup['sharelockpid'].append(pid)
+
+        # The last row logged by the backup
+        if pid == backup['pid'] or pid in backup['sharelockpid']:
+            backup['end'] = date
+
+    # Start a new backup from the date.
+    def new(self, date):
+        backup = {
+            'timestamp': None,
+            'pid': None,
+            'lockrequested': None,
+            'lockreleased': None,
+            'sharelockpid': [],
+            'start': date,
+            'end': date
+        }
+        self.backups.append(backup)
+        return backup
+
+    # Save the index, its written on a temporary file and renamed so that we never leave behind a
+    # index that is cut short.
+    def save(self):
+
+        try:
+            with open(self.filename + ".tmp", 'w') as f:
+                json.dump({'logfiles': self.indexed, 'backups': self.backups}, f)
+            os.rename(self.filename + ".tmp", self.filename)
+
+        # We have the backups to work with, we will read the logfiles again the next time
+        except (IOError, OSError), e:
+            logger.warn("Can't save the backup index: \"{0}\": \"{1}\"".format(
+                self.filename,
+                e
+            ))
+
+
+# Function: BackupIndexBuilder(hostmap)
+# Bring the index of the backups found on the master logfiles of the hostmap up to date and return it.
+# The master logfiles are read from the host where the program runs, i.e the master host.
+def BackupIndexBuilder(hostmap):
+
+    # Local Variable
+    logfiles = []
+
+    # The logfiles of the master on the hostmap
+    for line in StripHostmap(hostmap):
+        if len(line) > 3 and line[3] == "-1":
+            for log in line[1].split(","):
+                found = glob.glob(log)
+                if not found:
+                    logger.warn("The master logfile: \"{0}\" doesn't exist on this host".format(
+                        log
+                    ))
+                logfiles.extend(found)
+
+    # Without the master logfiles there is no way to find the backups
+    if not logfiles:
+        logger.error("None of the master logfile on the hostmap: \"{0}\" exists on this host, "
+                     "run the program on the master host to find the backups".format(
+            hostmap
+        ))
+        sys.exit(2)
+
+    # The logfiles are named by the time they were created, so they are read in that order.
+    index = BackupIndex(sorted(logfiles))
+    index.load()
+    index.update()
+    index.save()
+
+    logger.info("Found \"{0}\" backups on the master logfile(s): \"{1}\"".format(
+        len(index.backups),
+        ",".join(index.logfiles)
+    ))
+    return index
+
+
+# Function: BackupLister(hostmap)
+# Print the backups found on the master logfiles of the hostmap.
+def BackupLister(hostmap):
+
+    # Local Variable
+    fmt1 = globalVariable.Backupfmt1
+    fmt2 = globalVariable.Backupfmt2
+    backups = BackupIndexBuilder(hostmap).backups
+
+    if not backups:
+        print "\nNo backups found on the master logfile(s) of the hostmap: \"{0}\"\n".format(hostmap)
+        return
+
+    print ""
+    print fmt1.format('')
+    print fmt2.format('Timestamp', 'First Activity', 'Lock Released', 'Last Activity', 'Lock PID', 'Share Lock PIDs')
+    print fmt1.format('')
+    for backup in backups:
+        print fmt2.format(
+            backup['timestamp'] or '',
+            backup['start'],
+            backup['lockreleased'] or '',
+            backup['end'],
+            backup['pid'] or '',
+            len(backup['sharelockpid'])
+        )
+    print fmt1.format('')
+    print ""
+
+
+# Function: BackupWindow(hostmap, timestamp)
+# Returns the start time and the end time of the backup with the timestamp, found on the master logfiles
+# of the hostmap. The time is widen by the margin on both the sides to cover the clock difference of the hosts.
+def BackupWindow(hostmap, timestamp):
+
+    # Local Variable
+    margin = timedelta(seconds=globalVariable.backupmargin)
+    backups = [b for b in BackupIndexBuilder(hostmap).backups if b['timestamp'] == timestamp]
+
+    if not backups:
+        text = "ERROR: No backup with timestamp \"" + timestamp + "\" found on the master log, use -l to list them"
+        Usage(text)
+
+    # If the same timestamp was found more than once, its the latest one
+    backup = backups[-1]
+    StartTime = (datetime.strptime(backup['start'][0:19], '%Y-%m-%d %H:%M:%S') - margin).strftime('%Y-%m-%d %H:%M:%S')
+    EndTime = (datetime.strptime(backup['end'][0:19], '%Y-%m-%d %H:%M:%S') + margin).strftime('%Y-%m-%d %H:%M:%S')
+
+    logger.info("The backup: \"{0}\" was found on the master log from \"{1}\" to \"{2}\", "
+                "reading the logs from \"{3}\" to \"{4}\"".format(
+        timestamp,
+        backup['start'],
+        backup['end'],
+        StartTime,
+        EndTime
+    ))
+    return StartTime, EndTime
+
+
 # Function: ArgumentParser(argv)
 # This function parses the arguments supplied via the script
 # and check if everything is alright.
@@ -733,13 +2282,21 @@ def ArgumentParser(argv):
     contents = globalVariable.contents
     hostmapdates = globalVariable.hostmapdates
     debug = globalVariable.debug
+    parallel = globalVariable.parallel
+    outputformat = globalVariable.outputformat
+    profile = globalVariable.profile
+    trace = globalVariable.trace
+    transport = globalVariable.transport
+    delays = globalVariable.delays
+    listbackups = False
+    backup = None
     logger = globalVariable.logger
 
     # Try to get the options passed
     try:
         opts, args = getopt.getopt(
                 argv,
-                'hf:s:e:b:c:vd',
+                'hf:s:e:b:c:p:o:lt:P:Tx:D:vd',
                 [
                     'help',
                     'hostmap-file=',
@@ -747,6 +2304,14 @@ def ArgumentParser(argv):
                     'end-time=',
                     'build-hostmap=',
                     'contents=',
+                    'parallel=',
+                    'output-format=',
+                    'list-backups',
+                    'backup=',
+                    'profile=',
+                    'trace',
+                    'transport=',
+                    'delay=',
                     'version',
                     'debug'
                 ]
@@ -803,6 +2368,69 @@ def ArgumentParser(argv):
         elif opt in ('-c', '--contents'):
             contents = arg
 
+        elif opt in ('-p', '--parallel'):
+
+            # Check if the parallel is a positive number
+            try:
+                parallel = int(arg)
+            except ValueError:
+                parallel = 0
+            if parallel < 1:
+                text = "ERROR: -p should be a number greater than zero"
+                Usage(text)
+
+        elif opt in ('-o', '--output-format'):
+
+            # Check if its one of the format we know
+            outputformat = arg.lower()
+            if outputformat not in globalVariable.outputformats:
+                text = "ERROR: -o should be one of: " + ", ".join(globalVariable.outputformats)
+                Usage(text)
+
+        elif opt in ('-l', '--list-backups'):
+            listbackups = True
+
+        elif opt in ('-t', '--backup'):
+
+            # Check if its looks like the timestamp of the backup
+            backup = arg
+            if not globalVariable.backupkey_format.match(backup):
+                text = "ERROR: Incorrect data format for -t , should be \"YYYYMMDDHHMISS\""
+                Usage(text)
+
+        elif opt in ('-P', '--profile'):
+
+            # Check if its one of the profile we know
+            profile = arg.lower()
+            if profile not in globalVariable.profilemodes:
+                text = "ERROR: -P should be one of: " + ", ".join(globalVariable.profilemodes)
+                Usage(text)
+
+        elif opt in ('-T', '--trace'):
+            trace = True
+
+        elif opt in ('-x', '--transport'):
+
+            # Check if its one of the transport we know
+            transport = arg.lower()
+            if transport not in globalVariable.transports:
+                text = "ERROR: -x should be one of: " + ", ".join(globalVariable.transports)
+                Usage(text)
+
+        elif opt in ('-D', '--delay'):
+
+            # The delay of all the hosts and / or of the host, the seconds should be a positive number
+            delays = {}
+            for delay in arg.split(","):
+                host, seconds = delay.rpartition(":")[0::2]
+                try:
+                    delays[host] = float(seconds)
+                except ValueError:
+                    delays[host] = -1
+                if delays[host] < 0:
+                    text = "ERROR: Incorrect delay \"" + delay + "\" for -D , should be \"SECONDS\" or \"HOST:SECONDS\""
+                    Usage(text)
+
         elif opt in ('-d', '--debug'):
             debug = 1
             logging.basicConfig(
@@ -822,6 +2450,26 @@ def ArgumentParser(argv):
     # Parse check
     logger.info("Starting the program: {0}".format(__file__))
 
+    # The delay is of the local hosts
+    if delays and transport != 'local':
+        text = "ERROR: -D needs the local transport ( -x local )"
+        Usage(text)
+
+    # The backups are found from the master logfile on the hostmap, list them or get the start time
+    # and the end time of the backup asked for, so that the rest of the checks are the same.
+    if listbackups or backup:
+        if not filename:
+            text = "ERROR: -l & -t needs the hostmap file provided by the -f argument"
+            Usage(text)
+        elif StartTime or EndTime:
+            text = "ERROR: -l & -t cannot work along with arguments -s, -e"
+            Usage(text)
+        elif listbackups:
+            BackupLister(filename)
+            sys.exit(0)
+        else:
+            StartTime, EndTime = BackupWindow(filename, backup)
+
     # -b & -c cannot run along with -f,-s.-e
     # Since -b is to build a hostmap, so we cant run before building one.
     if hostmapdates and (filename or StartTime or EndTime):
@@ -836,11 +2484,13 @@ def ArgumentParser(argv):
 
     # If there is -b and -c pass on the contents provided by the parser.
     elif hostmapdates and contents:
-        HostmapBuilder(hostmapdates, contents)
+        TransportSetup(transport, delays)
+        HostmapBuilder(hostmapdates, contents, parallel)
 
     # is no content then pass on the default that is None
     elif hostmapdates and not contents:
-        HostmapBuilder(hostmapdates, contents)
+        TransportSetup(transport, delays)
+        HostmapBuilder(hostmapdates, contents, parallel)
 
     # if only -c is passed then error out, since we cant hunt for all logs
     # as that is cause a lot of time and maybe error prone.
@@ -871,11 +2521,11 @@ def ArgumentParser(argv):
     # the backup they are interested and when did it end,
     # so that we gather information for only those time.
     elif not filename or not StartTime or not EndTime:
-        text = "ERROR: -f,-s & -e parameters are mandatory for the script to run."
+        text = "ERROR: -f,-s & -e ( or -f & -t ) parameters are mandatory for the script to run."
         Usage(text)
 
     # Return the mandatory parameter to be used by the rest of the script.
-    return filename, StartTime, EndTime, debug
+    return filename, StartTime, EndTime, debug, parallel, outputformat, profile, trace, transport, delays
 
 
 # Function: parseHostfile(hostmap)
@@ -953,16 +2603,10 @@ def parseHostfile(hostmap):
     # the below ensure its is set to unique.
     hosts = list(set(hosts))
 
-    # Time to create work directory
-    logger.info("Creating work directory and splitting the hostmap by host")
-    for h in hosts:
-
-        # For each host create a working directory
-        CreateTempdir(h)
-
     # Lets start the program by calling the contents in the hostmap one by one
     # here we split the hostmap based on host and then send write it to temp
     # work directory
+    logger.info("Splitting the hostmap by host")
     for h in hosts:
 
         # Create a hostmap file by hostname
@@ -1114,7 +2758,10 @@ def SQLOutputFormatter(summary, basicinfo, segInfo):
              'Total Exec time(' + timeformat + ')',
              'Longest Run(' + timeformat + ')',
              'Shortest Run(' + timeformat + ')',
-             'Average Time(' + timeformat + ')'
+             'Average Time(' + timeformat + ')',
+             'p50(' + timeformat + ')',
+             'p95(' + timeformat + ')',
+             'p99(' + timeformat + ')'
     )
 
     # Write the heading information onto the logfile
@@ -1135,7 +2782,10 @@ def SQLOutputFormatter(summary, basicinfo, segInfo):
                  items['totalduration'] * timeconvertor,
                  items['maxduration'] * timeconvertor,
                  items['minduration']* timeconvertor,
-                 (items['totalduration']/items['execution']) * timeconvertor
+                 (items['totalduration']/items['execution']) * timeconvertor,
+                 items['histogram'].quantile(0.50) * timeconvertor,
+                 items['histogram'].quantile(0.95) * timeconvertor,
+                 items['histogram'].quantile(0.99) * timeconvertor
          ) + "\n",
                        dbid,
                        host
@@ -1150,13 +2800,82 @@ def SQLOutputFormatter(summary, basicinfo, segInfo):
 
     # Add the total time taken by the sql to the logfile
     LogFileWriter(
-        fmt4.format('Total', '', '', basicinfo['totalexecution'], basicinfo['totaltime'] * timeconvertor, '', '', '') +
+        fmt4.format(
+            'Total', '', '', basicinfo['totalexecution'], basicinfo['totaltime'] * timeconvertor, '', '', '',
+            basicinfo['histogram'].quantile(0.50) * timeconvertor,
+            basicinfo['histogram'].quantile(0.95) * timeconvertor,
+            basicinfo['histogram'].quantile(0.99) * timeconvertor
+        ) +
         "\n" +
         LineAdder + "\n",
             dbid,
             host
     )
 
+    # The same information as structured records
+    SQLRecordFormatter(
+            summary,
+            basicinfo,
+            segInfo
+    )
+
+
+# Function: SQLRecordFormatter(summary, basicinfo, segInfo)
+# Write the information of the PID and the summary of the statements run by the PID as records
+def SQLRecordFormatter(summary, basicinfo, segInfo):
+
+    # Local Variables
+    timeformat = globalVariable.timeFormat
+    timeconvertor = globalVariable.timeConvertor
+
+    if globalVariable.outputformat == 'text':
+        return
+
+    # The PID of the process by the mode
+    if basicinfo['mode'] == 'ExclusiveLock':
+        pid = basicinfo['ExclusiveLockPid']
+    elif basicinfo['mode'] == 'ShareLock':
+        pid = basicinfo['ShareLockPid']
+    else:
+        pid = basicinfo['SegmentPid']
+
+    # The information of the PID
+    record = {
+        'record': 'pid',
+        'mode': basicinfo['mode'],
+        'pid': pid,
+        'totalexecution': basicinfo['totalexecution'],
+        'totaltime': basicinfo['totaltime'] * timeconvertor,
+        'p50': basicinfo['histogram'].quantile(0.50) * timeconvertor,
+        'p95': basicinfo['histogram'].quantile(0.95) * timeconvertor,
+        'p99': basicinfo['histogram'].quantile(0.99) * timeconvertor,
+        'timeunit': timeformat
+    }
+    if basicinfo['mode'] == 'ExclusiveLock':
+        record['lockrequested'] = basicinfo['timeforlock']
+        record['lockreleased'] = basicinfo['timeforrelease']
+    RecordWriter(record, segInfo)
+
+    # The statements run by the PID
+    for items in sorted(summary, key=itemgetter('firstdate')):
+        RecordWriter({
+            'record': 'statement',
+            'mode': basicinfo['mode'],
+            'pid': pid,
+            'statement': items['statement'],
+            'firstdate': items['firstdate'],
+            'enddate': items['enddate'],
+            'execution': items['execution'],
+            'totalduration': items['totalduration'] * timeconvertor,
+            'maxduration': items['maxduration'] * timeconvertor,
+            'minduration': items['minduration'] * timeconvertor,
+            'avgduration': (items['totalduration'] / items['execution']) * timeconvertor,
+            'p50': items['histogram'].quantile(0.50) * timeconvertor,
+            'p95': items['histogram'].quantile(0.95) * timeconvertor,
+            'p99': items['histogram'].quantile(0.99) * timeconvertor,
+            'timeunit': timeformat
+        }, segInfo)
+
 
 # Function : CopyOutputFormatter(jsondatafile, host)
 # Once we get the merged data we then format the data and
@@ -1180,8 +2899,7 @@ def CopyOutputFormatter(jsondatafile, host):
     fmt3 = globalVariable.Copyfmt3
 
     # Lets read all then contents from the json file
-    with open(jsondatafile) as file:
-        data = json.load(file)
+    data = jsonReader(jsondatafile)
 
     # Lets have the heading information on the list
     # and store the addon information on a another list and
@@ -1303,10 +3021,193 @@ def CopyOutputFormatter(jsondatafile, host):
         )
 
 
-# Function: MasterLogReader(logfile, segInfo)
+# Function: ClubStatement(query)
+# The backup process runs the same statement on many relations, this function clubs
+# those statements into a single statement so that they are reported as one in the summary.
+def ClubStatement(query):
+
+    # We club all the LOCK TABLE as one statement
+    if query.startswith('LOCK TABLE'):
+        return "LOCK TABLE X IN ACCESS SHARE MODE"
+
+    # We club all the COPY statement as one statement
+    elif query.startswith('COPY'):
+        return "COPY X(x,y,z,..) TO stdout"
+
+    # We trim the statement into 28 character since after that some of the statement
+    # starts to add relation name which make that statement (even though the same) points as
+    # different statement.
+    elif query.upper().startswith('SELECT'):
+        return query[0:28].split("\n")[0]
+
+    # We club the search_path as one
+    elif query.upper().startswith('SET SEARCH_PATH'):
+        return "SET SEARCH_PATH X, pg_catalog"
+
+    # Rest of the statement we print as it is.
+    else:
+        return query
+
+
+# Class: LatencyHistogram()
+# This class keeps the log-scale histogram of the durations of the statements, the durations are counted
+# in buckets that grow by the latencyratio, so the memory used depends on the range of the durations
+# and not on the number of executions. The quantile is within the latencyratio of the actual duration.
+class LatencyHistogram():
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.minduration = 0
+        self.maxduration = 0
+
+    # Count the duration (in ms) on its bucket.
+    def add(self, duration):
+
+        if duration <= globalVariable.latencymin:
+            bucket = 0
+        else:
+            bucket = int(math.ceil(math.log(duration / globalVariable.latencymin) /
+                                   math.log(globalVariable.latencyratio)))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+        if not self.count or duration < self.minduration:
+            self.minduration = duration
+        if not self.count or duration > self.maxduration:
+            self.maxduration = duration
+        self.count += 1
+
+    # Add the counts of the other histogram to this histogram.
+    def merge(self, other):
+
+        if not other.count:
+            return
+        for bucket in other.buckets:
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + other.buckets[bucket]
+
+        if not self.count or other.minduration < self.minduration:
+            self.minduration = other.minduration
+        if not self.count or other.maxduration > self.maxduration:
+            self.maxduration = other.maxduration
+        self.count += other.count
+
+    # Return a new histogram with the same counts.
+    def copy(self):
+        histogram = LatencyHistogram()
+        histogram.merge(self)
+        return histogram
+
+    # The duration (in ms) that the quantile (0 to 1) of the executions took at most.
+    def quantile(self, quantile):
+
+        rank = quantile * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+
+                # The upper bound of the bucket, but never outside what we have seen
+                duration = globalVariable.latencymin * globalVariable.latencyratio ** bucket
+                return min(max(duration, self.minduration), self.maxduration)
+
+        return self.maxduration
+
+
+# Class: StatementAggregator(club)
+# This class collects the summary of the statements executed by a process, the summary is
+# kept by statement so that each row of the log is added to the summary in constant time.
+# If club is set the statements are clubbed (see ClubStatement) before they are added.
+class StatementAggregator():
+    def __init__(self, club=False):
+        self.club = club
+        self.statements = {}
+
+        # Total query executed, total time taken and the histogram of the durations of all the statements.
+        self.totalexecution = 0
+        self.totaltime = 0
+        self.histogram = LatencyHistogram()
+
+    # Add the statement executed at date that took duration (in ms) to the summary.
+    def add(self, statement, date, duration):
+
+        if self.club:
+            statement = ClubStatement(statement)
+
+        self.totalexecution += 1
+        self.totaltime += duration
+        self.histogram.add(duration)
+
+        # When we receive the statement we dont have that information on the summary
+        # So we make the first entry.
+        d = self.statements.get(statement)
+        if d is None:
+            self.statements[statement] = {
+                'statement': statement,
+                'execution': 1,
+                'firstdate': date,
+                'enddate': date,
+                'totalduration': duration,
+                'maxduration': duration,
+                'minduration': duration,
+                'histogram': LatencyHistogram()
+            }
+            self.statements[statement]['histogram'].add(duration)
+
+        # Now if we receive the same statement we already have that on the summary
+        else:
+            d['execution'] += 1
+            d['enddate'] = date
+            d['totalduration'] += duration
+            d['histogram'].add(duration)
+
+            # try to find who has the highest / lowest execution time
+            if d['maxduration'] < duration:
+                d['maxduration'] = duration
+            if d['minduration'] > duration:
+                d['minduration'] = duration
+
+    # Return a new aggregator with the statements of this aggregator clubbed.
+    def clubbed(self):
+
+        aggregator = StatementAggregator(club=True)
+        aggregator.totalexecution = self.totalexecution
+        aggregator.totaltime = self.totaltime
+        aggregator.histogram = self.histogram.copy()
+
+        for d in self.summary():
+            statement = ClubStatement(d['statement'])
+            s = aggregator.statements.get(statement)
+
+            if s is None:
+                s = dict(d)
+                s['statement'] = statement
+                s['histogram'] = d['histogram'].copy()
+                aggregator.statements[statement] = s
+
+            # Since the summary is in the order of the first date, the first date of the clubbed
+            # statement is already the lowest one.
+            else:
+                s['execution'] += d['execution']
+                s['totalduration'] += d['totalduration']
+                s['histogram'].merge(d['histogram'])
+                if s['enddate'] < d['enddate']:
+                    s['enddate'] = d['enddate']
+                if s['maxduration'] < d['maxduration']:
+                    s['maxduration'] = d['maxduration']
+                if s['minduration'] > d['minduration']:
+                    s['minduration'] = d['minduration']
+
+        return aggregator
+
+    # The summary of the statements in the order of they were first executed.
+    def summary(self):
+        return sorted(self.statements.values(), key=itemgetter('firstdate'))
+
+
+# Function: MasterLogReader(rows, segInfo, state)
 # This is the main function that reads the master log, this obtain the pid of the backup process
 # and gathers the statement, number of execution and the time it took to execute
-def MasterLogReader(logfile, segInfo):
+# The information gathered is kept on the state and returned, MasterLogReport writes it on the log.
+def MasterLogReader(rows, segInfo, state):
 
     # Local Variable
 
@@ -1317,11 +3218,213 @@ def MasterLogReader(logfile, segInfo):
     pDuration = globalVariable.row_duration
     pQuery = globalVariable.row_query
     pDumpLocation = globalVariable.row_dumplocation
+
+    # Variables to store the information gathered, they are kept on the state so that the information
+    # gathered so far can be saved on the checkpoint. When continuing from the checkpoint we start with
+    # the information we had gathered till there.
+    sharelockpid = state.setdefault('sharelockpid', set())
+    exclusivelockpid = state.setdefault('exclusivelockpid', set())
+
+    # Since we don't know which PID is the backup process until we have read the whole file,
+    # we buffer the information of all the PID's that has the duration clause here and pick
+    # the exclusive lock / share lock PID's once we reach the end of the file.
+    PidActivity = state.setdefault('PidActivity', {})
+
+    # The dumps found on the log, the dumps are (name, 'gpddboost' | 'filesystem').
+    dumps = state.setdefault('dumps', {
+        'dumpfile': None,
+        'postdumpfile': None
+    })
+
+    # We read the master log only once, during the read we find the pid of the user that
+    # executed the pg_class lock and the share lock and gather the information of all PID's
+    logger.info("Reading the logfile to capture the information of the exclusive lock PID & share lock PID")
+
+    # Read the rows one by one
+    for row in rows:
+
+        # While we capture the information of PID, lets get the dump file name and
+        # location, so that we can get the size of the dump, since in the master has two dumps
+        # we will use the exception clause to get the post data dump
+        if row[pDumpLocation].startswith('gp_dump_agent command line'):
+
+            # Dump file line
+            line = row[globalVariable.row_dumplocation]
+
+            # If the line has ddboost command on it.
+            if 'gpddboost' in line:
+
+                logger.debug("This a ddboost backup")
+
+                # fully qualified path
+                path = row[18].split('--to-file=')[1].split(" ")[0].rpartition('/')
+
+                # Filename of the dump.
+                dumplocation = path[-1]
+
+                # If file has postdata word
+                if 'post_data' in dumplocation:
+                    dumpkey = 'postdumpfile'
+
+                # If doesnt have post data then its actual dump
+                else:
+                    dumpkey = 'dumpfile'
+
+                dumps[dumpkey] = (dumplocation, 'gpddboost')
+
+            # If the backup is not at ddboost
+            else:
+
+                logger.debug("The backup is on the filesystem")
+
+                # Lets try reading the row which has the dump location information
+                try:
+                    dumplocation = line.split('>')[2].strip()
+                    dumpkey = 'dumpfile'
+
+                # Here we do expect a error, so lets use the error detection to find the post data
+                # dump location.
+                except IndexError:
+                    dumplocation = line.split('>')[1].strip()
+                    dumpkey = 'postdumpfile'
+
+                dumps[dumpkey] = (dumplocation, 'filesystem')
+
+            logger.debug("Dump file obtained for the segment (host/dbid/content): \"{0}/{1}/{2}\" is \"{3}\"".format(
+                segInfo['host'],
+                segInfo['dbid'],
+                segInfo['content'],
+                dumplocation
+            ))
+
+            # Lets get the size of the dump while we read the rest of the log.
+            DumpSizeRequest(dumps[dumpkey])
+
+        # The only way to identify the backup pid is to hunt for pg_class lock
+        # There is no other clear way as of the moment.
+        # In normal condition database users would not run lock on pg_class but if they do
+        # we may pick that process pid and gather the information, we can't put and check here
+        # since there is no clear differentator.
+        if row[pQuery] == "LOCK TABLE pg_catalog.pg_class IN EXCLUSIVE MODE;":
+            exclusivelockpid.add(row[pPid])
+
+        # During the same read of the logfile we will also hunt for the pid which executed the access share lock
+        # again , if the database users run share lock via their application job we may end up having the wrong pid
+        # there is nothing we can do but to print everything that was run by the user.
+        if row[pQuery].startswith('LOCK TABLE') and row[pQuery].endswith('IN ACCESS SHARE MODE'):
+            sharelockpid.add(row[pPid])
+
+        # We are interested on the rows that has the duration clause in it, rest we will skip.
+        # we buffer the information of the statement, number of time it was executed,
+        # duration and some basic info etc... for every PID
+        if row[pDuration].startswith("duration:"):
+
+            # The activity of the PID so far, first time we see the PID lets start with a clean slate.
+            activity = PidActivity.get(row[pPid])
+            if activity is None:
+                activity = PidActivity[row[pPid]] = {
+                    'timeforlock': 0,
+                    'timeforrelease': 0,
+                    'statements': StatementAggregator()
+                }
+
+            # Add the statement and the time it took to the summary of the PID
+            activity['statements'].add(
+                    row[pQuery],
+                    row[pDate],
+                    float(row[pDuration].split(' ')[1])
+            )
+
+            # Lets get the timestamp when the pg_class lock was issued
+            if row[pQuery] == "LOCK TABLE pg_catalog.pg_class IN EXCLUSIVE MODE;":
+                activity['timeforlock'] = row[pDate]
+
+            # Let get the timestamp to when the pg_class lock was released
+            if row[pQuery] == "COMMIT":
+                activity['timeforrelease'] = row[pDate]
+
+    exclusivelockpid = list(exclusivelockpid)
+    sharelockpid = list(sharelockpid)
+
+    logger.debug("Exclusive lock PID information obtained is: \"{0}\"".format(
+            exclusivelockpid
+                 ))
+
+    logger.debug("Share lock PID information obtained is: \"{0}\"".format(
+            sharelockpid
+                 ))
+
+    # Now if we provided the wrong dates (start time and end time) or no backup was run this can happen
+    # that we get no information of the PID, lets warn and continue with the rest of the log or steps.
+    if not exclusivelockpid:
+        logger.warn("Didn't find any PID that executed the pg_class exclusive lock on the master log, "
+                    "this may result in no information logged for the exclusive lock process")
+    if not sharelockpid:
+        logger.warn("Didn't find any PID that executed share lock on the master log, "
+                    "this may result in no information logged for the shared lock process")
+
+    # What we found on the log, i.e the exclusive lock / share lock PID's, their activity and the dumps
+    # We only need to keep the activity of the exclusive lock & share lock PID's
+    LogActivity = {
+        'exclusivelockpid': exclusivelockpid,
+        'sharelockpid': sharelockpid,
+        'PidActivity': {},
+        'dumpfile': dumps['dumpfile'],
+        'postdumpfile': dumps['postdumpfile']
+    }
+    for pid in exclusivelockpid + sharelockpid:
+        if pid in PidActivity:
+            LogActivity['PidActivity'][pid] = PidActivity[pid]
+
+    return LogActivity
+
+
+# Function: MasterLogReport(LogActivity, segInfo)
+# Write the information gathered by the MasterLogReader for the exclusive lock and
+# the share lock PID's on the log.
+def MasterLogReport(LogActivity, segInfo):
+
+    # Local Variable
+    exclusivelockpid = LogActivity['exclusivelockpid']
+    sharelockpid = LogActivity['sharelockpid']
+    PidActivity = LogActivity['PidActivity']
     sizeConvertor = globalVariable.sizeConvertor
+    dumpsize = 0
+    postdumpsize = 0
+
+    # The size of the dumps of the master
+    if LogActivity['dumpfile'] or LogActivity['postdumpfile']:
+        logger.info("Getting the size of the dump for the segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
+            segInfo['host'],
+            segInfo['dbid'],
+            segInfo['content']
+        ))
 
-    # Variables to store the information gathered.
-    sharelockpid = []
-    exclusivelockpid = []
+    if LogActivity['dumpfile']:
+        dumpsize = DumpSizes.size(LogActivity['dumpfile']) / sizeConvertor
+        logger.debug("Backup stats (path|size): \"{0}|{1}\"".format(
+            LogActivity['dumpfile'][0],
+            dumpsize
+        ))
+        RecordWriter({
+            'record': 'dump',
+            'dump': 'dump',
+            'file': LogActivity['dumpfile'][0],
+            'bytes': DumpSizes.size(LogActivity['dumpfile'])
+        }, segInfo)
+
+    if LogActivity['postdumpfile']:
+        postdumpsize = DumpSizes.size(LogActivity['postdumpfile']) / sizeConvertor
+        logger.debug("Backup stats (path|size): \"{0}|{1}\"".format(
+            LogActivity['postdumpfile'][0],
+            postdumpsize
+        ))
+        RecordWriter({
+            'record': 'dump',
+            'dump': 'post_data',
+            'file': LogActivity['postdumpfile'][0],
+            'bytes': DumpSizes.size(LogActivity['postdumpfile'])
+        }, segInfo)
 
     # Basic information on the PID that stores that executed the Exclusive lock
     InfoExclusiveLock = {
@@ -1333,8 +3436,8 @@ def MasterLogReader(logfile, segInfo):
         'timeforrelease': '',
         'totalexecution': 0,
         'totaltime': 0,
-        'dumpsize': 0,
-        'postdumpsize': 0
+        'dumpsize': dumpsize,
+        'postdumpsize': postdumpsize
     }
 
     # Basic information on the PID that stores that executed the Share lock
@@ -1347,414 +3450,143 @@ def MasterLogReader(logfile, segInfo):
         'totaltime': 0
     }
 
-    # We read the master log aka Input file 3 times
-    # first read to find the pid of the user that executed the pg_class lock and the share lock
-    try:
-        file = open(logfile, 'rb')
+    # Now we have obtained the pid that executed the exclusive lock, lets pick the information
+    # about the statement, number of time it was executed, duration and some basic info etc...
+    # from the information we have buffered.
+    for expid in exclusivelockpid:
 
-    # What if during this time the log was deleted by log_cleanup, since the file cannot be read
-    # we will exit.
-    except IOError:
-        logger.error("Can't read the logfile: \"{0}\"".format(
-                     logfile
+        logger.info("Collecting the information for all "
+                    "things run by exclusive lock process: \"{0}\"".format(
+            expid
         ))
-        sys.exit(2)
-
-    # Reading the file
 
-    with file as csvfile:
-        reader = csv.reader(csvfile, delimiter=',')
-        logger.info("Reading the logfile to identify the exclusive lock PID & share lock PID")
+        # If the PID has run any statement with the duration clause, we have data.
+        if expid in PidActivity:
+            activity = PidActivity[expid]
+            InfoExclusiveLock['flag'] = 'DATA'
+            InfoExclusiveLock['ExclusiveLockPid'] = expid
+            InfoExclusiveLock['totalexecution'] = activity['statements'].totalexecution
+            InfoExclusiveLock['totaltime'] = activity['statements'].totaltime
+            InfoExclusiveLock['histogram'] = activity['statements'].histogram
+            InfoExclusiveLock['timeforlock'] = activity['timeforlock']
+            InfoExclusiveLock['timeforrelease'] = activity['timeforrelease']
+            SummaryExclusiveLock = activity['statements'].summary()
+        else:
+            InfoExclusiveLock['flag'] = 'NO DATA'
 
-        # Read the file row by row
+        # Reality Check, Lets check if we have data for the exclusive lock PID
+        # If we do then lets call the SQL Formatter and print the information on the log
+        if InfoExclusiveLock['ExclusiveLockPid'] != 0 and InfoExclusiveLock['flag'] == 'DATA':
+            logger.debug("Calling Exclusive Lock SQL Formatter "
+                         "for master segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
+                segInfo['host'],
+                segInfo['dbid'],
+                segInfo['content']
 
-        for row in reader:
+            ))
+            SQLOutputFormatter(
+                    SummaryExclusiveLock,
+                    InfoExclusiveLock,
+                    segInfo
+            )
 
-            # While we capture the information of PID, lets get the dump file name and
-            # location, so that we can get the size of the dump, since in the master has two dumps
-            # we will use the exception clause to get the post data dump
-            if row[pDumpLocation].startswith('gp_dump_agent command line'):
+        # If there is no DATA then write the information on the logs as NO DATA Available
+        # and provide a warning message to the user and continue with the
+        # rest of the steps.
+        elif InfoExclusiveLock['flag'] == 'NO DATA':
 
-                logger.info("Getting the size of the dump for the segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
-                    segInfo['host'],
-                    segInfo['dbid'],
-                    segInfo['content']
-                ))
-                # Dump file line
-                line = row[globalVariable.row_dumplocation]
+            logger.warn("Obtained no information about the exclusive lock PID:\"{0}\", seems like"
+                        " log_duration was not turned on or invalid start/end time specified".format(
+                exclusivelockpid
+            ))
 
-                # If the line has ddboost command on it.
-                if 'gpddboost' in line:
+            text = "\n NO DATA found for the Exclusive lock process PID: \"{0}\" " \
+                   "on segment (host/dbid/content): \"{1}/{2}/{3}\"" \
+                   " Check on the Start Time and End Time" \
+                   " or check on if the log_duration GUC is turned on".format(
+                exclusivelockpid,
+                segInfo['host'],
+                segInfo['dbid'],
+                segInfo['content']
+            )
 
-                    logger.debug("This a ddboost backup")
+            LogFileWriter(
+                text,
+                segInfo['dbid'],
+                segInfo['host']
+            )
 
-                    # fully qualified path
-                    path = row[18].split('--to-file=')[1].split(" ")[0].rpartition('/')
+    # Now we have obtained the pid that executed the share lock, lets pick the information
+    # about the statement, number of time it was executed, duration and some basic info etc...
+    # from the information we have buffered.
+    for shpid in sharelockpid:
 
-                    # Filename of the dump.
-                    dumplocation = path[-1]
+        logger.info("Collecting the information for all things "
+                    "run by share lock process: \"{0}\"".format(
+                shpid
+        ))
 
-                    # If file has postdata word
-                    if 'post_data' in dumplocation:
+        # If the PID has run any statement with the duration clause, we have data.
+        # The share lock process statements are clubbed into a single statement.
+        if shpid in PidActivity:
+            statements = PidActivity[shpid]['statements'].clubbed()
+            InfoShareLock['flag'] = 'DATA'
+            InfoShareLock['ShareLockPid'] = shpid
+            InfoShareLock['totalexecution'] = statements.totalexecution
+            InfoShareLock['totaltime'] = statements.totaltime
+            InfoShareLock['histogram'] = statements.histogram
+            SummaryShareLock = statements.summary()
+        else:
+            InfoShareLock['flag'] = 'NO DATA'
 
-                        # Get the file size
-                        FileSize = ddboost_dump_size(dumplocation, 'Y') / sizeConvertor
-                        InfoExclusiveLock['postdumpsize'] = FileSize
+        # Reality Check, Lets check if we have data for the share lock PID
+        # If we do then lets call the SQL Formatter and print the information on the log
+        if InfoShareLock['ShareLockPid'] != 0 and InfoShareLock['flag'] == 'DATA':
+            logger.debug("Calling Share Lock SQL Formatter for master segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
+                segInfo['host'],
+                segInfo['dbid'],
+                segInfo['content']
 
-                    # If doesnt have post data then its actual dump
-                    else:
-                        FileSize = ddboost_dump_size(dumplocation, 'N') / sizeConvertor
-                        InfoExclusiveLock['dumpsize'] = FileSize
+            ))
 
-                    logger.debug("Backup stats (path|filename|size): \"{0}|{1}|{2}\"".format(
-                        path,
-                        dumplocation,
-                        FileSize
-                    ))
-
-                # If the backup is not at ddboost
-                else:
-
-                    logger.debug("The backup is on the filesystem")
-
-                    # Lets try reading the row which has the dump location information
-                    try:
-                        dumplocation = line.split('>')[2].strip()
-                        FileSize = DumpSize(dumplocation) / sizeConvertor
-                        InfoExclusiveLock['dumpsize'] = FileSize
-
-                    # Here we do expect a error, so lets use the error detection to find the post data
-                    # dump location and size.
-                    except IndexError:
-                        dumplocation = line.split('>')[1].strip()
-                        FileSize = DumpSize(dumplocation) / sizeConvertor
-                        InfoExclusiveLock['postdumpsize'] = FileSize
-
-                    logger.debug("Backup stats (path|size): \"{0}|{1}\"".format(
-                        dumplocation,
-                        FileSize
-                    ))
-
-            # The only way to identify the backup pid is to hunt for pg_class lock
-            # There is no other clear way as of the moment.
-            # In normal condition database users would not run lock on pg_class but if they do
-            # we may pick that process pid and gather the information, we can't put and check here
-            # since there is no clear differentator.
-            if row[pQuery] == "LOCK TABLE pg_catalog.pg_class IN EXCLUSIVE MODE;":
-                exclusivelockpid.append(row[pPid])
-                exclusivelockpid = list(set(exclusivelockpid))
-
-            # During the same read of the logfile we will also hunt for the pid which executed the access share lock
-            # again , if the database users run share lock via their application job we may end up having the wrong pid
-            # there is nothing we can do but to print everything that was run by the user.
-            if row[pQuery].startswith('LOCK TABLE') and row[pQuery].endswith('IN ACCESS SHARE MODE'):
-                sharelockpid.append(row[pPid])
-                sharelockpid = list(set(sharelockpid))
-
-        logger.debug("Exclusive lock PID information obtained is: \"{0}\"".format(
-                exclusivelockpid
-                     ))
-
-        logger.debug("Share lock PID information obtained is: \"{0}\"".format(
-                exclusivelockpid
-                     ))
-
-        # Now if we provided the wrong dates (start time and end time) or no backup was run this can happen
-        # that we get no information of the PID, lets warn and continue with the rest of the log or steps.
-        if not exclusivelockpid:
-            logger.warn("Didn't find any PID that executed the pg_class exclusive lock on the master log, "
-                        "this may result in no information logged for the exclusive lock process")
-        if not sharelockpid:
-            logger.warn("Didn't find any PID that executed share lock on the master log, "
-                        "this may result in no information logged for the shared lock process")
-
-        # This is the second read of the log file
-        # Now we have obtained the pid that executed the exclusive lock, lets gather information
-        # about the statement, number of time it was executed, duration and some basic info etc...
-        for expid in exclusivelockpid:
-
-            # Reset the data for each PID's
-            InfoExclusiveLock['flag'] = 'NO DATA'
-            InfoExclusiveLock['totalexecution'] = 0
-            SummaryExclusiveLock = []
-            InfoExclusiveLock['timeforlock'] = 0
-            InfoExclusiveLock['timeforrelease'] = 0
-            InfoExclusiveLock['totaltime'] = 0
-
-            logger.info("Reading the logfile to capture the information for all "
-                        "things run by exclusive lock process: \"{0}\"".format(
-                expid
-            ))
-
-            # Go to the start of the file again.
-            file.seek(0)
-
-            # Read data line by line
-            for row in reader:
-
-                # We are interested on the rows with that pid and that line that has the duration clause in it
-                # rest we will skip.
-                if row[pPid] == expid and row[pDuration].split(' ')[0] == "duration:":
-
-                    # We found the statement lets gather information
-
-                    # Lets disable the flag
-                    InfoExclusiveLock['flag'] = 'DATA'
-
-                    # Statement
-                    statement = row[pQuery]
-
-                    # Pid of the process.
-                    InfoExclusiveLock['ExclusiveLockPid'] = expid
-
-                    # Total query executed by the PID ( incrementing each time we find one row )
-                    InfoExclusiveLock['totalexecution'] += 1
-
-                    # Total time taken by the PID ( Summing all duration each time we find one row )
-                    InfoExclusiveLock['totaltime'] += float(row[pDuration].split(' ')[1])
-
-                    # When we receive the statement we dont have that information on the list
-                    # So we make the first entry.
-                    if not any(d['statement'] == statement for d in SummaryExclusiveLock):
-                        SummaryExclusiveLock.append(
-                                {
-                                    'statement': statement,
-                                    'execution': 1,
-                                    'firstdate': row[pDate],
-                                    'enddate': row[pDate],
-                                    'totalduration': float(row[pDuration].split(' ')[1]),
-                                    'maxduration': float(row[pDuration].split(' ')[1]),
-                                    'minduration': float(row[pDuration].split(' ')[1])
-                                 }
-                        )
-
-                    # Now if we receive the same statement we already have that on the list
-                    else:
-                        for d in SummaryExclusiveLock:
-                            if d['statement'] == statement:
-
-                                # this time we just increment
-                                d['execution'] += 1
-
-                                # We capture the end time
-                                d['enddate'] = row[pDate]
-
-                                # Sum the duration
-                                d['totalduration'] += float(row[pDuration].split(' ')[1])
-
-                                # try to find who has the highest execution time
-                                if d['maxduration'] < float(row[pDuration].split(' ')[1]):
-                                    d['maxduration'] = float(row[pDuration].split(' ')[1])
-
-                                # try to find who has the lowest execution time
-                                if d['minduration'] > float(row[pDuration].split(' ')[1]):
-                                    d['minduration'] = float(row[pDuration].split(' ')[1])
-
-                    # Lets get the timestamp when the pg_class lock was issued
-                    if row[pQuery] == "LOCK TABLE pg_catalog.pg_class IN EXCLUSIVE MODE;":
-                        InfoExclusiveLock['timeforlock'] = row[pDate]
-
-                    # Let get the timestamp to when the pg_class lock was released
-                    if row[pQuery] == "COMMIT":
-                        InfoExclusiveLock['timeforrelease'] = row[pDate]
-
-            # Reality Check, Lets check if we have data for the exclusive lock PID
-            # If we do then lets call the SQL Formatter and print the information on the log
-            if InfoExclusiveLock['ExclusiveLockPid'] != 0 and InfoExclusiveLock['flag'] == 'DATA':
-                logger.debug("Calling Exclusive Lock SQL Formatter "
-                             "for master segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
-                    segInfo['host'],
-                    segInfo['dbid'],
-                    segInfo['content']
-
-                ))
-                SQLOutputFormatter(
-                        SummaryExclusiveLock,
-                        InfoExclusiveLock,
-                        segInfo
-                )
-
-            # If there is no DATA then write the information on the logs as NO DATA Available
-            # and provide a warning message to the user and continue with the
-            # rest of the steps.
-            elif InfoExclusiveLock['flag'] == 'NO DATA':
-
-                logger.warn("Obtained no information about the exclusive lock PID:\"{0}\", seems like"
-                            " log_duration was not turned on or invalid start/end time specified".format(
-                    exclusivelockpid
-                ))
-
-                text = "\n NO DATA found for the Exclusive lock process PID: \"{0}\" " \
-                       "on segment (host/dbid/content): \"{1}/{2}/{3}\"" \
-                       " Check on the Start Time and End Time" \
-                       " or check on if the log_duration GUC is turned on".format(
-                    exclusivelockpid,
-                    segInfo['host'],
-                    segInfo['dbid'],
-                    segInfo['content']
-                )
-
-                LogFileWriter(
-                    text,
-                    segInfo['dbid'],
-                    segInfo['host']
-                )
+            SQLOutputFormatter(
+                    SummaryShareLock,
+                    InfoShareLock,
+                    segInfo
+            )
 
-        # This is the third and last read of the log file
-        # Now we have obtained the pid that executed the share lock, lets gather information
-        # about the statement, number of time it was executed, duration and some basic info etc...
-        for shpid in sharelockpid:
+        # If there is no DATA then write the information on the logs as NO DATA Available
+        # and provide a warning message to the user and continue with the
+        # rest of the steps.
+        elif InfoShareLock['flag'] == 'NO DATA':
 
-            # Reset the data for each PID's
-            InfoShareLock['flag'] = 'NO DATA'
-            InfoShareLock['totalexecution'] = 0
-            SummaryShareLock = []
-            InfoShareLock['timeforlock'] = 0
-            InfoShareLock['timeforrelease'] = 0
-            InfoShareLock['totaltime'] = 0
-
-            logger.info("Reading the logfile to capture the information for all things "
-                        "run by share lock process: \"{0}\"".format(
-                    shpid
+            logger.warn("Obtained no information about the share lock PID:\"{0}\", seems like"
+                        " log_duration was not turned on or invalid start/end time specified".format(
+                sharelockpid
             ))
 
-            # Go to the start of the file again.
-            file.seek(0)
-
-            # Read data line by line
-            for row in reader:
-
-                # We are interested on the rows with that pid and that line that has the duration clause in it
-                # rest we will skip.
-                if row[pPid] == shpid and row[pDuration].split(' ')[0] == "duration:":
-
-                    # We found the statement lets gather information
-
-                    # Lets disable the flag
-                    InfoShareLock['flag'] = 'DATA'
-
-                    # Pid of the process.
-                    InfoShareLock['ShareLockPid'] = shpid
-
-                    # Total query executed by the PID ( incrementing each time we find one row )
-                    InfoShareLock['totalexecution'] += 1
-
-                    # Total time taken by the PID ( Summing all duration each time we find one row )
-                    InfoShareLock['totaltime'] += float(row[pDuration].split(' ')[1])
-
-                    # Statement
-                    # We club all the LOCK TABLE as one statement
-                    if row[pQuery].startswith('LOCK TABLE'):
-                       statement = "LOCK TABLE X IN ACCESS SHARE MODE"
-
-                    # We club all the COPY statement as one statement
-                    elif row[pQuery].startswith('COPY'):
-                       statement = "COPY X(x,y,z,..) TO stdout"
-
-                    # We trim the statement into 28 character since after that some of the statement
-                    # starts to add relation name which make that statement (even though the same) points as
-                    # different statement.
-                    elif row[pQuery].upper().startswith('SELECT'):
-                       statement = row[pQuery][0:28].split("\n")[0]
-
-                    # We club the search_path as one
-                    elif row[pQuery].upper().startswith('SET SEARCH_PATH'):
-                       statement = "SET SEARCH_PATH X, pg_catalog"
-
-                    # Rest of the statement we print as it is.
-                    else:
-                       statement = row[pQuery]
-
-                    # When we receive the statement we dont have that information on the list
-                    # So we make the first entry.
-                    if not any(d['statement'] == statement for d in SummaryShareLock):
-                        SummaryShareLock.append(
-                                {
-                                    'statement' : statement,
-                                    'execution' : 1,
-                                    'firstdate' : row[pDate],
-                                    'enddate' : row[pDate],
-                                    'totalduration' : float(row[pDuration].split(' ')[1]),
-                                    'maxduration' : float(row[pDuration].split(' ')[1]),
-                                    'minduration' : float(row[pDuration].split(' ')[1])
-                                 }
-                         )
-
-                    # Now if we receive the same statement we already have that on the list
-                    else:
-                        for d in SummaryShareLock:
-                            if d['statement'] == statement:
-
-                                # this time we just increment
-                                d['execution'] += 1
-
-                                # We capture the end time
-                                d['enddate'] = row[pDate]
-
-                                # Sum the duration
-                                d['totalduration'] += float(row[pDuration].split(' ')[1])
-
-                                # try to find who has the highest execution time
-                                if d['maxduration'] < float(row[pDuration].split(' ')[1]):
-                                    d['maxduration'] = float(row[pDuration].split(' ')[1])
-
-                                # try to find who has the lowest execution time
-                                if d['minduration'] > float(row[pDuration].split(' ')[1]):
-                                    d['minduration'] = float(row[pDuration].split(' ')[1])
-
-            # Reality Check, Lets check if we have data for the share lock PID
-            # If we do then lets call the SQL Formatter and print the information on the log
-            if InfoShareLock['ShareLockPid'] != 0 and InfoShareLock['flag'] == 'DATA':
-                logger.debug("Calling Share Lock SQL Formatter for master segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
-                    segInfo['host'],
-                    segInfo['dbid'],
-                    segInfo['content']
-
-                ))
-
-                SQLOutputFormatter(
-                        SummaryShareLock,
-                        InfoShareLock,
-                        segInfo
-                )
-
-            # If there is no DATA then write the information on the logs as NO DATA Available
-            # and provide a warning message to the user and continue with the
-            # rest of the steps.
-            elif InfoShareLock['flag'] == 'NO DATA':
-
-                logger.warn("Obtained no information about the share lock PID:\"{0}\", seems like"
-                            " log_duration was not turned on or invalid start/end time specified".format(
-                    sharelockpid
-                ))
-
-                text = "\n\n NO DATA found for the Shared lock process PID: \"{0}\" " \
-                       "on segment (host/dbid/content): \"{1}/{2}/{3}\"" \
-                       " Check on the Start Time and End Time" \
-                       " or check on if the log_duration GUC is turned on\n\n".format(
-                    sharelockpid,
-                    segInfo['host'],
-                    segInfo['dbid'],
-                    segInfo['content']
-                )
-
-                LogFileWriter(
-                    text,
-                    segInfo['dbid'],
-                    segInfo['host']
-                )
+            text = "\n\n NO DATA found for the Shared lock process PID: \"{0}\" " \
+                   "on segment (host/dbid/content): \"{1}/{2}/{3}\"" \
+                   " Check on the Start Time and End Time" \
+                   " or check on if the log_duration GUC is turned on\n\n".format(
+                sharelockpid,
+                segInfo['host'],
+                segInfo['dbid'],
+                segInfo['content']
+            )
 
-    # Since we have finished reading the merge file lets remove them
-    logger.info("Finished reading the merged file, removing the file: \"{0}\"".format(
-        logfile
-    ))
-    os.remove(logfile)
+            LogFileWriter(
+                text,
+                segInfo['dbid'],
+                segInfo['host']
+            )
 
 
-# Function: SegmentLogReader(logfile, segInfo)
+# Function: SegmentLogReader(rows, segInfo)
 # This is the function that reads all the segment, this obtain the pid of the backup process
 # and gathers the statement, number of execution and the time it took to execute
-def SegmentLogReader(logfile, segInfo):
+# The information gathered is returned, SegmentLogReport writes it on the log.
+def SegmentLogReader(rows, segInfo, state):
 
     # Local variables
     # The below parameters tells the segment log reader where you will find
@@ -1764,314 +3596,312 @@ def SegmentLogReader(logfile, segInfo):
     pDuration = globalVariable.row_duration
     pQuery = globalVariable.row_query
     pDumpLocation = globalVariable.row_dumplocation
-    sizeConvertor = globalVariable.sizeConvertor
     timeConvertor = globalVariable.timeConvertor
 
-    # Variables to store the information gathered.
-    SegmentProcesspid = []
-    AddCopyDuration = 0
+    # Variables to store the information gathered, what is gathered while reading the log is kept on the state
+    # so that the information gathered so far can be saved on the checkpoint. When continuing from the
+    # checkpoint we start with the information we had gathered till there.
+    SegmentProcesspid = state.setdefault('SegmentProcesspid', set())
+    dumpfile = state.setdefault('dumpfile', None)
     CopyTimeCollector = {}
-    SummarySegmentQuery = []
-    InfoSegmentProcess = {
-        'mode': 'Segment Process',
-        'DBInfo': segInfo,
-        'flag': 'NO DATA',
-        'SegmentPid': 0,
-        'totalexecution': 0,
-        'totaltime': 0
+    copydumpfile = None
+    lastcopy = ''
+
+    # Since we don't know which PID is the backup process until we have read the whole file,
+    # we buffer the information of all the PID's that has the duration clause here and pick
+    # the share lock PID's once we reach the end of the file.
+    PidActivity = state.setdefault('PidActivity', {})
+
+    # What we found on the log, i.e the share lock PID's, their activity, the COPY data
+    # and the dump written by the COPY.
+    LogActivity = {
+        'SegmentProcesspid': [],
+        'PidActivity': {},
+        'CopyTimeCollector': {},
+        'copydumpfile': None
     }
 
-    # Json datafile to store the COPY data
-    jsondatafile = "copy_" + segInfo['host'] + "_" + __file__ + ".data"
-
-    # We read the master log aka Input file 2 times
-    # first read to find the pid of the user that executed the share lock on the segments
-    try:
-        file = open(logfile, 'rb')
+    # Information of the segment to be used by the copy collector
+    infoSeg = 'gpseg' + segInfo['content'] + "/dbid(" + segInfo['dbid'] + ")"
 
-    # What if during this time the log was deleted by log_cleanup, since the file cannot be read
-    # we will exit.
-    except IOError:
-        logger.error("Can't read the logfile: \"{0}\"".format(
-                     logfile
-        ))
-        sys.exit(2)
-
-    # Reading the file
-    with file as csvfile:
-        reader = csv.reader(csvfile, delimiter=',')
-
-        logger.info("Reading the logfile to identify the share lock PID on the "
-                    "log for segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
-            segInfo['host'],
-            segInfo['dbid'],
-            segInfo['content']
-        ))
-
-        # Read the file row by row
-        for row in reader:
-
-            # The only way to detect that that is the backup process is, backup
-            # takes in share lock for the process so we capture that PID of the process that
-            # executed the share lock and use that as the base line to hunt for
-            # rest of the information
-            if row[pQuery].startswith('LOCK TABLE') and row[pQuery].endswith('IN ACCESS SHARE MODE'):
-                SegmentProcesspid.append(row[pPid])
-                SegmentProcesspid = list(set(SegmentProcesspid))
-
-        logger.debug("Share lock PID information obtained is: \"{0}\"".format(
-                SegmentProcesspid
-                     ))
-
-        # Now if we provided the wrong dates (start time and end time),GUC log_duration was not turned ON
-        # or no backup was run this can happen that we get no information of the PID,
-        # lets warn and continue with the rest of the log or steps.
-        if not SegmentProcesspid:
-            logger.warn("Didn't find any PID that execuated share lock on the segment log, "
-                        "this may result in no information logged for the share lock process")
-
-        # This is the second read of the log file
-        # Now we have obtained the pid that executed the share lock, lets gather information
-        # about the statement, number of time it was executed, duration and some basic info etc...
-        for segpid in SegmentProcesspid:
-
-            logger.info("Reading the logfile to capture the information for all "
-                        "things run by segment backup process: \"{0}\"".format(
-                segpid
-            ))
-
-            # Move the pointer to start of the file
-            file.seek(0)
-
-            # Read again row by row
-            for row in reader:
-
-                # During this read we will try to get the size of the dump by this segment
-                if row[pDumpLocation].startswith('gp_dump_agent command line'):
-
-                    logger.info("Getting the size of the dump for the segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
-                        segInfo['host'],
-                        segInfo['dbid'],
-                        segInfo['content']
-                    ))
-
-                    # Dump file line
-                    line = row[pDumpLocation]
-
-                    # If the line has ddboost command on it.
-                    if 'gpddboost' in line:
-
-                        logger.debug("This a ddboost backup")
+    # We read the segment log only once, during the read we find the pid of the user
+    # that executed the share lock on the segments and gather the information of all PID's
+    logger.info("Reading the logfile to capture the information of the share lock PID on the "
+                "log for segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
+        segInfo['host'],
+        segInfo['dbid'],
+        segInfo['content']
+    ))
 
-                        # fully qualified path
-                        path = row[18].split('--to-file=')[1].split(" ")[0].rpartition('/')
+    # Read the rows one by one
+    for row in rows:
 
-                        # Filename of the dump.
-                        dumplocation = path[-1]
+        # The only way to detect that that is the backup process is, backup
+        # takes in share lock for the process so we capture that PID of the process that
+        # executed the share lock and use that as the base line to hunt for
+        # rest of the information
+        if row[pQuery].startswith('LOCK TABLE') and row[pQuery].endswith('IN ACCESS SHARE MODE'):
+            SegmentProcesspid.add(row[pPid])
 
-                        # Get the file size
-                        FileSize = ddboost_dump_size(dumplocation, 'N') / sizeConvertor
+        # During this read we will try to get the name of the dump by this segment,
+        # the size of the dump is obtained while we read the rest of the file.
+        if row[pDumpLocation].startswith('gp_dump_agent command line'):
 
-                        logger.debug("Backup stats (path|filename|size): \"{0}|{1}|{2}\"".format(
-                                path,
-                                dumplocation,
-                                FileSize
-                        ))
+            # Dump file line
+            line = row[pDumpLocation]
 
-                    # If the backup is not at ddboost
-                    else:
+            # If the line has ddboost command on it, then its the filename of the dump.
+            if 'gpddboost' in line:
+                logger.debug("This a ddboost backup")
+                dumpfile = (row[18].split('--to-file=')[1].split(" ")[0].rpartition('/')[-1], 'gpddboost')
+                state['dumpfile'] = dumpfile
 
-                        logger.debug("This a filesystem backup")
+            # If the backup is not at ddboost, lets read the row which has the dump location information
+            else:
+                logger.debug("This a filesystem backup")
+                dumpfile = (line.split('>')[2].strip(), 'filesystem')
+                state['dumpfile'] = dumpfile
 
-                        # Lets try reading the row which has the dump location information
-                        dumplocation = line.split('>')[2].strip()
-                        FileSize = DumpSize(dumplocation) / sizeConvertor
+            logger.debug("Dump file obtained for the segment (host/dbid/content): \"{0}/{1}/{2}\" is \"{3}\"".format(
+                segInfo['host'],
+                segInfo['dbid'],
+                segInfo['content'],
+                dumpfile[0]
+            ))
+            DumpSizeRequest(dumpfile)
+
+        # If the rows has duration lets gather information.
+        if row[pDuration].startswith("duration:"):
+
+            # Get the query information and the time it took
+            statement = row[pQuery]
+            duration = float(row[pDuration].split(' ')[1])
+
+            # The activity of the PID so far, first time we see the PID lets start with a clean slate.
+            activity = PidActivity.get(row[pPid])
+            if activity is None:
+                activity = PidActivity[row[pPid]] = {
+                    'statements': StatementAggregator(club=True),
+                    'copy': {},
+                    'copyduration': 0,
+                    'lastcopy': '',
+                    'dumpfile': None
+                }
+
+            # If the row has a COPY statement then lets get the data from it
+            if statement.startswith('COPY'):
+
+                # Get the table name
+                tableName = statement.split(' ')[1]
+
+                # Get the duration of the COPY statement
+                duration = float("%.2f" % float(duration * timeConvertor))
+
+                # Let keep adding the duration to know the total time
+                # it took for finish all the COPY statement
+                activity['copyduration'] += duration
+
+                # The dump that was being written when the COPY was executed
+                activity['lastcopy'] = row[pDate]
+                activity['dumpfile'] = dumpfile
+
+                # Now lets starts recording the data of duration took to backup the table
+                # on the segments
+                if tableName not in activity['copy']:
+                    activity['copy'][tableName] = duration
+
+            # We club all the LOCK TABLE, SELECT & SET SEARCH_PATH statement as ONE
+            # and add it to the summary of the PID.
+            else:
+                activity['statements'].add(
+                        statement,
+                        row[pDate],
+                        duration
+                )
 
-                        logger.debug("Backup stats (path|size): \"{0}|{1}\"".format(
-                            dumplocation,
-                            FileSize
-                        ))
+    SegmentProcesspid = list(SegmentProcesspid)
 
-                # If the rows matches the PID and it has duration lets gather information.
-                if row[pPid] == segpid and row[pDuration].split(' ')[0] == "duration:":
+    logger.debug("Share lock PID information obtained is: \"{0}\"".format(
+            SegmentProcesspid
+                 ))
 
-                    # Lets disable the flag
-                    InfoSegmentProcess['flag'] = 'DATA'
+    # Now if we provided the wrong dates (start time and end time),GUC log_duration was not turned ON
+    # or no backup was run this can happen that we get no information of the PID,
+    # lets warn and continue with the rest of the log or steps.
+    if not SegmentProcesspid:
+        logger.warn("Didn't find any PID that execuated share lock on the segment log, "
+                    "this may result in no information logged for the share lock process")
 
-                    # Get the query information
-                    statement = row[pQuery]
+    # Now we have obtained the pid that executed the share lock, lets pick the time it took
+    # to backup the tables from the information we have buffered, for all the share lock PID's.
+    for segpid in SegmentProcesspid:
 
-                    # Store the PID information
-                    InfoSegmentProcess['SegmentPid'] = segpid
+        if segpid in PidActivity:
+            activity = PidActivity[segpid]
+            LogActivity['PidActivity'][segpid] = activity
 
-                    # Information of the segment to be used by the copy collector
-                    infoSeg = 'gpseg' + segInfo['content'] + "/dbid(" + segInfo['dbid'] + ")"
+            # Let add the Info of the segment to the copy collector is it not present
+            if infoSeg not in CopyTimeCollector:
+                CopyTimeCollector[infoSeg] = {}
 
-                    # Let add the Info of the segment to the copy collector is it not present
-                    if infoSeg not in CopyTimeCollector:
-                            CopyTimeCollector[infoSeg] = {}
+            # Lets merge the time it took to backup the tables by this PID onto the copy collector
+            if activity['copy']:
+                for tableName in activity['copy']:
+                    if tableName not in CopyTimeCollector[infoSeg]:
+                        CopyTimeCollector[infoSeg][tableName] = activity['copy'][tableName]
 
-                    # If the row has a COPY statement then lets get the data from it
-                    if statement.startswith('COPY'):
+                # Lets create a addon in that dict to store some basic info ( i.e Dump Size, Total Duration )
+                if 'InfoAddonstmts' not in CopyTimeCollector[infoSeg]:
+                    CopyTimeCollector[infoSeg]['InfoAddonstmts'] = {
+                        'SegDumpsize': 0,
+                        'TotalstmtDuration': 0
+                    }
+                CopyTimeCollector[infoSeg]['InfoAddonstmts']['TotalstmtDuration'] += activity['copyduration']
 
-                        # Get the table name
-                        tableName = statement.split(' ')[1]
+                # The size of the dump is of the dump file that was written by the last COPY
+                if activity['lastcopy'] >= lastcopy:
+                    lastcopy = activity['lastcopy']
+                    copydumpfile = activity['dumpfile']
 
-                        # Get the duration of the COPY statement
-                        duration = float("%.2f" % float(float(row[pDuration].split(' ')[1]) * timeConvertor))
+    # If we have the COPY data, the size of the dump is obtained when its reported
+    if copydumpfile and 'InfoAddonstmts' in CopyTimeCollector[infoSeg]:
+        LogActivity['copydumpfile'] = copydumpfile
 
-                        # Let keep adding the duration to know the total time
-                        # it took for finish all the COPY statement
-                        AddCopyDuration += duration
+    LogActivity['SegmentProcesspid'] = SegmentProcesspid
+    LogActivity['CopyTimeCollector'] = CopyTimeCollector
+    return LogActivity
 
-                        # Lets create a addon in that dict to store some basic info
-                        CopyTimeCollector[infoSeg]['InfoAddonstmts'] = {}
 
-                        # And store the information on the addons ( i.e Dump Size, Total Duration
-                        CopyTimeCollector[infoSeg]['InfoAddonstmts']['SegDumpsize'] = FileSize
-                        CopyTimeCollector[infoSeg]['InfoAddonstmts']['TotalstmtDuration'] = AddCopyDuration
+# Function: SegmentLogReport(LogActivity, segInfo)
+# Write the information gathered by the SegmentLogReader for the share lock PID's on the log
+# and store the COPY data to the json datafile of the host.
+def SegmentLogReport(LogActivity, segInfo):
 
-                        # Now lets starts recording the data of duration took to backup the table
-                        # on the segments
-                        if tableName not in CopyTimeCollector[infoSeg]:
-                            CopyTimeCollector[infoSeg][tableName] = duration
+    # Local Variable
+    SegmentProcesspid = LogActivity['SegmentProcesspid']
+    PidActivity = LogActivity['PidActivity']
+    jsondata = None
 
-                    else:
+    # Json datafile to store the COPY data
+    jsondatafile = "copy_" + segInfo['host'] + "_" + __file__ + ".data"
 
-                        # Total query executed by the PID ( incrementing each time we find one row )
-                        InfoSegmentProcess['totalexecution'] += 1
+    # Now we have obtained the pid that executed the share lock, lets pick the information
+    # about the statement, number of time it was executed, duration and some basic info etc...
+    # from the information we have buffered, for all the share lock PID's.
+    for segpid in SegmentProcesspid:
 
-                        # Total time taken by the PID ( Summing all duration each time we find one row )
-                        InfoSegmentProcess['totaltime'] += float(row[pDuration].split(' ')[1])
+        logger.info("Collecting the information for all "
+                    "things run by segment backup process: \"{0}\"".format(
+            segpid
+        ))
 
-                        # We club all the LOCK TABLE statement as ONE
-                        if row[pQuery].startswith('LOCK TABLE'):
-                            statement="LOCK TABLE X IN ACCESS SHARE MODE"
+        # Reality Check, Lets check if we have data for the share lock PID
+        # If we do then lets call the SQL Formatter and print the information on the log
+        if segpid in PidActivity:
+            activity = PidActivity[segpid]
+
+            InfoSegmentProcess = {
+                'mode': 'Segment Process',
+                'DBInfo': segInfo,
+                'flag': 'DATA',
+                'SegmentPid': segpid,
+                'totalexecution': activity['statements'].totalexecution,
+                'totaltime': activity['statements'].totaltime,
+                'histogram': activity['statements'].histogram
+            }
+
+            # Formatting the SQL Formatter to format the SQL statements
+            logger.debug("Calling SQL Formatter for segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
+                segInfo['host'],
+                segInfo['dbid'],
+                segInfo['content']
 
-                        # We trim the statement into 28 character since after that some of the statement
-                        # starts to add relation name which make that statement (even though the same) points as
-                        # different statement. The reason for split is some SQL has statement on multi lines
-                        # so when made a merge file multi lines are not placed on the file , this causes the SQL
-                        # with multi lines to takes dates from the next lines, so the split ensures we only take in
-                        # SQL and doesnt provide any invalid message
-                        elif row[pQuery].upper().startswith('SELECT'):
-                            statement = row[pQuery][0:28].split("\n")[0]
+            ))
+            SQLOutputFormatter(
+                    activity['statements'].summary(),
+                    InfoSegmentProcess,
+                    segInfo
+            )
 
-                        # We club the search_path as one
-                        elif row[pQuery].upper().startswith('SET SEARCH_PATH'):
-                            statement = "SET SEARCH_PATH X, pg_catalog"
+            # Since we have the information lets give the information of the
+            # json file to be used by the formatter.
+            jsondata = jsondatafile
 
-                        # Rest we leave at it is
-                        else:
-                            statement = row[pQuery]
-
-                        # When we receive the statement we dont have that information on the list
-                        # So we make the first entry.
-                        if not any(d['statement'] == statement for d in SummarySegmentQuery):
-                            SummarySegmentQuery.append(
-                                  {
-                                     'statement' : statement,
-                                     'execution' : 1,
-                                     'firstdate' : row[pDate],
-                                     'enddate' : row[pDate],
-                                     'totalduration' : float(row[pDuration].split(' ')[1]),
-                                     'maxduration' : float(row[pDuration].split(' ')[1]),
-                                     'minduration' : float(row[pDuration].split(' ')[1])
-                                  }
-                            )
-
-                        # Now if we receive the same statement we already have that on the list
-                        else:
-                            for d in SummarySegmentQuery:
-                                if d['statement'] == statement:
-                                    # this time we just increment
-                                    d['execution'] += 1
-
-                                    # We capture that last timestamp when this was execited
-                                    d['enddate'] = row[pDate]
-
-                                    # Sum up all the duration of this statement
-                                    d['totalduration'] += float(row[pDuration].split(' ')[1])
-
-                                    # try to find who has the highest execution time
-                                    if d['maxduration'] < float(row[pDuration].split(' ')[1]):
-                                        d['maxduration'] = float(row[pDuration].split(' ')[1])
-
-                                    # try to find who has the lowest execution time
-                                    if d['minduration'] > float(row[pDuration].split(' ')[1]):
-                                        d['minduration'] = float(row[pDuration].split(' ')[1])
-
-            # Reality Check, Lets check if we have data for the share lock PID
-            # If we do then lets call the SQL Formatter and print the information on the log
-            if InfoSegmentProcess['SegmentPid'] != 0 and InfoSegmentProcess['flag'] == 'DATA':
-
-                # Calling the JsonWriter to store all the data from COPY to a single file
-                logger.debug("Calling Json Writer to store the COPY data "
-                             "for segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
-                    segInfo['host'],
-                    segInfo['dbid'],
-                    segInfo['content']
+        # If there is no DATA then write the information on the logs as NO DATA Available
+        # and provide a warning message to the user and continue with the
+        # rest of the steps.
+        else:
 
-                ))
-                jsonWriter(CopyTimeCollector, jsondatafile)
+            logger.warn("Obtained no information about the share lock PID:\"{0}\", seems like"
+                        " log_duration was not turned on or invalid start/end time specified".format(
+                SegmentProcesspid
+            ))
 
-                # Formatting the SQL Formatter to format the SQL statements
-                logger.debug("Calling SQL Formatter for segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
-                    segInfo['host'],
-                    segInfo['dbid'],
-                    segInfo['content']
+            text = "\n\n NO DATA found for the Shared lock process PID: \"{0}\" " \
+                   "on segment (host/dbid/content): \"{1}/{2}/{3}\"" \
+                   " Check on the Start Time and End Time" \
+                   " or check on if the log_duration GUC is turned on\n\n".format(
+                SegmentProcesspid,
+                segInfo['host'],
+                segInfo['dbid'],
+                segInfo['content']
+            )
 
-                ))
-                SQLOutputFormatter(
-                        SummarySegmentQuery,
-                        InfoSegmentProcess,
-                        segInfo
-                )
+            LogFileWriter(
+                text,
+                segInfo['dbid'],
+                segInfo['host']
+            )
 
-                # Since we have finished reading the merge file lets remove them
-                logger.info("Finished reading the merged file, removing the file: \"{0}\"".format(
-                    logfile
-                ))
-                os.remove(logfile)
+    # If we have the COPY data, lets get the size of the dump written by the COPY
+    copydumpfile = LogActivity['copydumpfile']
+    if jsondata and copydumpfile:
 
-                # Since we have return the information lets give the information of the
-                # json file to be used by the formatter.
-                return jsondatafile
+        logger.info("Getting the size of the dump for the segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
+            segInfo['host'],
+            segInfo['dbid'],
+            segInfo['content']
+        ))
 
-            # If there is no DATA then write the information on the logs as NO DATA Available
-            # and provide a warning message to the user and continue with the
-            # rest of the steps.
-            # TODO: need to find out the error if there is no return file
-            elif InfoSegmentProcess['flag'] == 'NO DATA':
+        infoSeg = 'gpseg' + segInfo['content'] + "/dbid(" + segInfo['dbid'] + ")"
+        SegDumpsize = DumpSizes.size(copydumpfile) / globalVariable.sizeConvertor
+        LogActivity['CopyTimeCollector'][infoSeg]['InfoAddonstmts']['SegDumpsize'] = SegDumpsize
+        logger.debug("Backup stats (path|size): \"{0}|{1}\"".format(
+            copydumpfile[0],
+            SegDumpsize
+        ))
+        RecordWriter({
+            'record': 'dump',
+            'dump': 'dump',
+            'file': copydumpfile[0],
+            'bytes': DumpSizes.size(copydumpfile)
+        }, segInfo)
+
+    # If we have the COPY data, call the JsonWriter to store all the data from COPY to a single file
+    if jsondata:
+        logger.debug("Calling Json Writer to store the COPY data "
+                     "for segment (host/dbid/content): \"{0}/{1}/{2}\"".format(
+            segInfo['host'],
+            segInfo['dbid'],
+            segInfo['content']
 
-                logger.warn("Obtained no information about the share lock PID:\"{0}\", seems like"
-                            " log_duration was not turned on or invalid start/end time specified".format(
-                    SegmentProcesspid
-                ))
+        ))
+        jsonWriter(LogActivity['CopyTimeCollector'], jsondatafile)
 
-                text = "\n\n NO DATA found for the Shared lock process PID: \"{0}\" " \
-                       "on segment (host/dbid/content): \"{1}/{2}/{3}\"" \
-                       " Check on the Start Time and End Time" \
-                       " or check on if the log_duration GUC is turned on\n\n".format(
-                    SegmentProcesspid,
-                    segInfo['host'],
-                    segInfo['dbid'],
-                    segInfo['content']
-                )
+        # The time it took to backup each table as records
+        for infoSeg in LogActivity['CopyTimeCollector']:
+            for table in sorted(LogActivity['CopyTimeCollector'][infoSeg]):
+                if table != 'InfoAddonstmts':
+                    RecordWriter({
+                        'record': 'copy',
+                        'table': table,
+                        'duration': LogActivity['CopyTimeCollector'][infoSeg][table],
+                        'timeunit': globalVariable.timeFormat
+                    }, segInfo)
 
-                LogFileWriter(
-                    text,
-                    segInfo['dbid'],
-                    segInfo['host']
-                )
+    # Return the name of the json file if we have data, so that it can be used by the formatter.
+    return jsondata
 
-    # Since we have finished reading the merge file lets remove them, we place one at the end of the segment reader
-    # because in case if there is no DATA then we will leave orphan file on the directory, so making sure we will clean
-    # it up ...
-    logger.info("Finished reading the merged file, removing the file: \"{0}\"".format(
-        logfile
-    ))
-    os.remove(logfile)
 
 # Function : RunProgram()
 # This function is now running on the segment servers
@@ -2079,16 +3909,16 @@ def SegmentLogReader(logfile, segInfo):
 def RunProgram():
 
     # Local Variable
-    tempdir = globalVariable.tempdir
     segInfo = {}
-    Path = ''
     jsondatafile = None
+    reported = []
 
     # Let get the Start time and end time from the OS Env.
     host = os.getenv('host1', '')
     StartTime = os.getenv('StartTime', '')
     EndTime = os.getenv('EndTime', '')
     debug = os.getenv('debug', '')
+    globalVariable.outputformat = os.getenv('OutputFormat', 'text')
 
     # There is one issue the logger from now on ( i.e if its INFO / DEBUG )
     # The logger config information that was set in the Argument Parser is lost
@@ -2131,48 +3961,35 @@ def RunProgram():
         ))
         sys.exit(2)
 
-    # Now lets go through the segment information on the hostmap and start the reader
+    # Now lets go through the segment information on the hostmap and check the logfiles
+    # of each segment before we start the readers
     logger.info("Filtering / Merging the logfile by Start time and End time for each segments")
+    Segments = []
     for segment in SegmentInfo:
-        segInfo['host'] = segment[0]
-        segInfo['logfile'] = segment[1]
-        segInfo['dbid'] = segment[2]
-        segInfo['content'] = segment[3]
+        segInfo = {
+            'host': segment[0],
+            'logfile': segment[1],
+            'dbid': segment[2],
+            'content': segment[3]
+        }
         logger.debug("Received the segment information content: \"{0}\", dbid: \"{1}\"".format(
                 segInfo['content'],
                 segInfo['dbid']
 
         ))
 
-        # We expect hostfile to be on a single location, but to be on safe side if the user provide logfile
-        # at multiple location, lets take one of the logfile directory to create a inputfile.
-        logfiles = segment[1].split(",")
-        for logfile in logfiles:
-            if os.path.isfile(logfile):
-                Path = os.path.dirname(logfile)
-
-        if not Path:
-            logger.error("None of the logfile provided "
-                         "for segment (host/dbid/content): \"{0}/{1}/{2}\" exists, exiting...".format(
-                segInfo['host'],
-                segInfo['dbid'],
-                segInfo['content']
-            ))
-            sys.exit(2)
-
-        # If there are multiple logfile of the same date, we will merge them to a single file
-        # this helps in reducing complexity with the code and its much quicker, since in that file
+        # If there are multiple logfile of the same date, we will merge them to a single stream of rows
+        # this helps in reducing complexity with the code and its much quicker, since in that stream
         # we have only the contents from start time to the end time, so less content to read.
+        logfiles = []
         for log in segInfo['logfile'].split(","):
 
-            logger.debug("Reading / Merging / Filtering the logfile: \"{0}\" to a single file".format(
-                log
-            ))
-
-            # If the file exits call the FileMerger script to Merge the contents of the logfile to a single file.
-            # Once done provide us with the Input file name to do the rest of the operation.
+            # If the file exits add it to the logfiles to be merged
             if os.path.exists(log):
-                InputFile = InputFileMerger(Path, log, StartTime, EndTime)
+                logger.debug("Reading / Merging / Filtering the logfile: \"{0}\"".format(
+                    log
+                ))
+                logfiles.append(log)
 
             # If there is no logfile from the provided list warn the user, maybe the logfile was removed using
             # dca_log_cleanup if this is a DCA machine or some other script or its a wrong logfile name don't know..
@@ -2185,24 +4002,179 @@ def RunProgram():
                         segInfo['dbid']
                 ))
 
-        logger.debug("The merged file for the content: \"{0}\", dbid: \"{1}\" is \"{2}\"".format(
-            segInfo['content'],
-            segInfo['dbid'],
-            InputFile
-
+        if not logfiles:
+            logger.error("None of the logfile provided "
+                         "for segment (host/dbid/content): \"{0}/{1}/{2}\" exists, exiting...".format(
+                segInfo['host'],
+                segInfo['dbid'],
+                segInfo['content']
             ))
+            sys.exit(2)
+
+        segInfo['logfiles'] = logfiles
+        Segments.append((segInfo, StartTime, EndTime))
+
+    # The segments are read by a pool of worker process, one per core on the host
+    # ( up to segmentparallel ), if there is only one segment there is no point in a pool.
+    workers = min(multiprocessing.cpu_count(), globalVariable.segmentparallel, len(Segments))
+    if workers > 1:
+        logger.info("Reading the logfile of \"{0}\" segments using \"{1}\" worker process".format(
+            len(Segments),
+            workers
+        ))
+        # The dumps found by the workers are sent here so that the size of the dumps are obtained
+        # while the workers read the logs.
+        dumpsizequeue = multiprocessing.Queue()
+        listener = threading.Thread(target=DumpSizeListener, args=(dumpsizequeue,))
+        listener.setDaemon(True)
+        listener.start()
+
+        pool = multiprocessing.Pool(workers, SegmentWorkerInit, (dumpsizequeue,))
+        results = pool.imap(SegmentAnalyzer, Segments)
+    else:
+        pool = None
+        results = map(SegmentAnalyzer, Segments)
+
+    # The results are received in the order of the hostmap, so the reports
+    # of the segments are written always in the same order.
+    try:
+        for segInfo, LogActivity, phases in results:
+
+            # The time of the phases on the worker process
+            Profiler.merge(phases)
+
+            # If the worker failed to read the segment logfile, there is nothing to report
+            if LogActivity is None:
+                logger.error("Failed in reading the logfile "
+                             "for segment (host/dbid/content): \"{0}/{1}/{2}\", exiting...".format(
+                    segInfo['host'],
+                    segInfo['dbid'],
+                    segInfo['content']
+                ))
+                sys.exit(2)
+
+            # if the content is of the master call the master log report
+            if segInfo['content'] == "-1":
+                MasterLogReport(
+                        LogActivity,
+                        segInfo
+                )
+
+            # for the rest of the content, call the segment report
+            else:
+                jsondatafile = SegmentLogReport(
+                        LogActivity,
+                        segInfo
+                ) or jsondatafile
+
+            # We are done with the segment, lets write its log to the disk
+            ReportFiles.flush()
+            reported.append(segInfo)
+
+    finally:
+        if pool:
+            pool.terminate()
+            pool.join()
+            dumpsizequeue.put(None)
 
-        # If the merged file is of the size zero, lets inform the user that you may get no data for that
-        # segment , this can happen due to invalid start time / end time or log_duration is not turned on
-        # if the log_duration not ON then segment don't log much information as most queries are run on the
-        # master.
-        SizeOfMergeFile = os.path.getsize(InputFile)
+    # Okie so we are the end of the script now.
+    # Let call the copy formmatter to format all the copy data from
+    # all the segment of this host.
+    if jsondatafile:
 
-        if SizeOfMergeFile == 0:
-            logger.warn("The merged file: \"{0}\" seems to be of the size zero, "
-                        "seems like there is no contents on the file".format(
-                InputFile
+        logger.info("Formatting the time data obtained in backing up tables for segment host: \"{0}\"".format(
+                segInfo['host']
             ))
+        CopyOutputFormatter(jsondatafile, segInfo['host'])
+
+    # All the logs are written, lets close them
+    ReportFiles.close()
+
+    # The reports of the segments are complete, so a run again must read the logfiles from the start.
+    for segInfo in reported:
+        LogCheckpoint(segInfo, StartTime, EndTime).remove()
+
+
+# Function: RemoteProgram()
+# This is where the program starts on the host when launched by the LaunchProcess, the hostmap of the host
+# is read from the stdin and the RunProgram is run in a private work directory, the logs are then
+# sent back on the stdout as a single payload and the work directory is removed.
+def RemoteProgram():
+
+    # Local Variable
+    host = os.getenv('host1', '')
+    hostmap = sys.stdin.read(int(sys.stdin.readline()))
+
+    # Nothing other than the payload should reach the stdout, so from now on anything written on the
+    # stdout by the program or the commands it runs goes to the stderr.
+    sys.stdout.flush()
+    payload = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)
+
+    # If the profile or the trace is asked for, lets time the phases of the program on this host.
+    Profiler.enable(os.getenv('Profile', ''), os.getenv('Trace', '') == '1', host)
+
+    started = time.time()
+    WrkDir = tempfile.mkdtemp(prefix='wrkdir_' + __file__ + '_')
+    os.chdir(WrkDir)
+    try:
+        with open("hostmap_" + host, "wb") as f:
+            f.write(hostmap)
+        Profiler.record(host, "Create the work directory", started, time.time())
+
+        Profiler.runcall(host + "_" + __file__ + ".prof", RunProgram)
+        Profiler.save(host + "_" + __file__ + ".profile")
+
+        PayloadWriter(payload, sorted(glob.glob("*{0}.log".format(__file__)) +
+                                      glob.glob("*{0}.records".format(__file__)) +
+                                      glob.glob("*{0}.profile".format(__file__)) +
+                                      glob.glob("*{0}.prof".format(__file__))))
+
+    finally:
+        os.chdir("/")
+        shutil.rmtree(WrkDir, True)
+
+
+# Function: SegmentWorkerInit(dumpsizequeue)
+# Start of the worker process of the RunProgram, the dumps found by the worker are sent on the dumpsizequeue.
+def SegmentWorkerInit(dumpsizequeue):
+    globalVariable.dumpsizequeue = dumpsizequeue
+    Profiler.reset()
+
+
+# Function: DumpSizeListener(dumpsizequeue)
+# Pass on the dumps found by the worker process to the DumpSizes, until we receive None.
+def DumpSizeListener(dumpsizequeue):
+    while True:
+        dumpfile = dumpsizequeue.get()
+        if dumpfile is None:
+            return
+        DumpSizes.request(dumpfile)
+
+
+# Function: SegmentAnalyzer((segInfo, StartTime, EndTime))
+# Read the logfiles of the segment from the start time to the end time and return the information
+# gathered by the respective reader, this runs on the worker process of the RunProgram.
+# Along with it the phases timed on the worker process are returned when the profile is asked for.
+def SegmentAnalyzer(segment):
+
+    # Local Variable
+    segInfo, StartTime, EndTime = segment
+
+    # The progress of reading the logfiles of the segment, if the program was stopped before
+    # while reading these logfiles we continue from there.
+    checkpoint = LogCheckpoint(segInfo, StartTime, EndTime)
+    checkpoint.load()
+
+    # The rows from the logfiles, the logfiles are read by the readers as they go through the rows.
+    rows = InputFileMerger(segInfo['logfiles'], StartTime, EndTime, checkpoint)
+
+    # The stats of the cProfile of the reader, if asked for
+    statsfile = segInfo['dbid'] + "_" + segInfo['host'] + "_" + __file__ + ".prof"
+
+    # A sys.exit on the worker would leave the pool waiting forever for the result,
+    # so we send back no information and let the RunProgram exit.
+    try:
 
         # Based on the content, Lets call the respective reader
         # if the content is of the master call the master log reader
@@ -2214,9 +4186,12 @@ def RunProgram():
                 segInfo['dbid'],
                 segInfo['content']
             ))
-            MasterLogReader(
-                    InputFile,
-                    segInfo
+            LogActivity = Profiler.runcall(
+                    statsfile,
+                    MasterLogReader,
+                    rows,
+                    segInfo,
+                    checkpoint.state
             )
 
         # for the rest of the content, call the segment reader
@@ -2227,24 +4202,24 @@ def RunProgram():
                 segInfo['dbid'],
                 segInfo['content']
             ))
-            jsondatafile = SegmentLogReader(
-                    InputFile,
-                    segInfo
+            LogActivity = Profiler.runcall(
+                    statsfile,
+                    SegmentLogReader,
+                    rows,
+                    segInfo,
+                    checkpoint.state
             )
 
-    # Okie so we are the end of the script now.
-    # Let call the copy formmatter to format all the copy data from
-    # all the segment of this host.
-    if jsondatafile:
+    except SystemExit:
+        LogActivity = None
 
-        logger.info("Formatting the time data obtained in backing up tables for segment host: \"{0}\"".format(
-                segInfo['host']
-            ))
-        CopyOutputFormatter(jsondatafile, segInfo['host'])
+    return segInfo, LogActivity, Profiler.collect()
 
 
-# Function: LaunchProcess(hostmapper, StartTime, EndTime)
+# Function: LaunchProcess(host, StartTime, EndTime, debug)
 # The below function makes call to the segments and start the information capture.
+# The program and the hostmap of the host are sent on the stdin of a single ssh ( or the transport asked for )
+# to the host and the logs of the host are received back on its stdout.
 def LaunchProcess(host, StartTime, EndTime, debug):
 
     logger.info("Attempting to launch the process on host: \"{0}\"".format(
@@ -2252,185 +4227,376 @@ def LaunchProcess(host, StartTime, EndTime, debug):
     ))
 
     # Local variables.
-    py_string = os.getenv('GPHOME', '')
     tempdir = globalVariable.tempdir
+    bootstrap = globalVariable.bootstrap
     WrkDir = os.path.dirname(os.path.realpath(__file__))
+    program = os.path.basename(__file__)
 
     # With a space between the dates we cannot send the start time
     # and the endtime to segment, so we remove them initially and later put it back.
     StartTime = StartTime.replace(" ","")
     EndTime = EndTime.replace(" ","")
 
-    # Let's try to guess at the python environment.  If we have GPHOME set we'll use it otherwise
-    # We'll need to default to whatever is current in the shell
-    if py_string:
-        py_string = 'source ' + os.path.join(py_string, 'greenplum_path.sh') + '; '
-
-    # Now let's just quick check the host as to whether the python version is >= 2.6
-    logger.info("Check to ensure the version of python running is less than 2.6.0")
+    # The data sent to the host, the bootstrap, the program and the hostmap of the host.
     try:
-        subprocess.check_call(
-                "ssh -T %s '%s python -c \"import sys; sys.exit(1) if sys.hexversion < 0x020600f0 else 0\"'" %
-                (
-                    host,
-                    py_string
-                ),
-                shell=True
-        )
-    except subprocess.CalledProcessError, e:
-        print >> sys.stderr, 'Python version on host " %s " is < 2.6.0.  Aborting' % (host)
-        sys.exit(1)
-
-    # Copy the script to remote site so that the script can be executed at the remote site.
-    # We use /tmp since that directory is accessiable by all users of unix
-    # and also the information gather by this script is not that big as well it should be in kb's
-    logger.info("scp the script file: \"{0}\" to the host: \"{1}:{2}\"".format(
-            __file__,
-            host,
-            tempdir
-    ))
-    try:
-        subprocess.check_call(
-                'scp -q %s %s:%s' %
-                (
-                    __file__ ,
-                    host,
-                    tempdir
-                ),
-                shell=True
-        )
-    except subprocess.CalledProcessError, e:
-        err = 'Error when trying to copy script to %s:%s' % (host, tempdir)
+        with open(os.path.realpath(__file__), "rb") as f:
+            script = f.read()
+        with open(tempdir + "/hostmap_" + host, "rb") as f:
+            hostmap = f.read()
+    except IOError, e:
+        err = 'Error when trying to read the script or hostmap_%s: %s' % (host, e)
         print >> sys.stderr, err
         sys.exit(1)
 
-    # Copy the hostmap to remote site so that the script knows the segments it has to work on
-    logger.info("scp the hostmap file: \"hostmap_{0}\" to the host: \"{1}:{2}\"".format(
-            host,
-            host,
-            tempdir
-    ))
-    try:
-        subprocess.check_call(
-                'scp -q %s/hostmap_%s %s:%s' %
-                (
-                    tempdir,
-                    host,
-                    host,
-                    tempdir
-                ),
-                shell=True
-        )
-    except subprocess.CalledProcessError, e:
-        err = 'Error when trying to copy hostmap_%s to %s:%s' % (
-            host,
-            host,
-            tempdir
-        )
-        print >> sys.stderr, err
-        sys.exit(1)
+    data = "{0}\n{1}{2} {3}\n{4}{5}\n{6}".format(
+        len(bootstrap),
+        bootstrap,
+        program,
+        len(script),
+        script,
+        len(hostmap),
+        hostmap
+    )
 
-    # SSH is doing something with it's terminal handling here I don't fully understand
-    # If we don't force the creation of a pseudo TTY the ssh hangs
+    # The python on the host checks its version ( >= 2.6 ) before running the program.
     logger.info("Launching the program to check for checking the backup time on host: \"{0}\"".format(
             host
     ))
     try:
-        subprocess.check_call(
-                "ssh -qtt %s \"%s cd %s; "
-                "export host1=%s; "
-                "export StartTime=%s; "
-                "export EndTime=%s; "
-                "export debug=%s; "
-                "python -c 'import %s ; %s.RunProgram();' \"" %
-                (
-                    host,
-                    py_string,
-                    tempdir,
-                    host,
-                    '"' + StartTime + '"',
-                    EndTime,
-                    debug,
-                    __file__.split(".")[0],
-                    __file__.split(".")[0]
-                ),
-                shell=True
+        output = HostPipe(
+                Transport.launch(host, [
+                    ('host1', host),
+                    ('StartTime', StartTime),
+                    ('EndTime', EndTime),
+                    ('debug', debug),
+                    ('OutputFormat', globalVariable.outputformat),
+                    ('Profile', globalVariable.profile),
+                    ('Trace', int(globalVariable.trace))
+                ]),
+                host,
+                data
         )
     except subprocess.CalledProcessError, e:
-        err = 'Error when trying to execute the script on host %s, aborting' % (host)
+        if e.returncode == 3:
+            print >> sys.stderr, 'Python version on host " %s " is < 2.6.0.  Aborting' % (host)
+        else:
+            err = 'Error when trying to execute the script on host %s, aborting' % (host)
+            print >> sys.stderr, err
+        sys.exit(1)
+
+    # Anything the host wrote before the payload ( like from the greenplum_path.sh ) goes to the screen.
+    text, files = PayloadReader(output)
+    for line in text.splitlines():
+        OutputLock.acquire()
+        try:
+            sys.stdout.write("[{0}] {1}\n".format(host, line.rstrip('\r')))
+            sys.stdout.flush()
+        finally:
+            OutputLock.release()
+
+    if files is None:
+        err = 'Error when trying to receive the logs from host %s, aborting' % (host)
         print >> sys.stderr, err
         sys.exit(1)
 
-    # Copy all the file back to the main host(i.e mostly it should be master
+    # Write all the logs received to the main host(i.e mostly it should be master
     # Or from the host where the script was called.
-    logger.info("Copying the contents from: \"{0}:{1}\" to the main host directory: \"{2}\"".format(
+    logger.info("Writing the \"{0}\" logs received from host: \"{1}\" to the main host directory: \"{2}\"".format(
+            len(files),
             host,
-            tempdir,
             WrkDir
     ))
-    try:
-        subprocess.check_call(
-                'scp -q %s:%s/*%s.log %s' %
-                (
+    started = time.time()
+    for name, contents in files:
+        with open(os.path.join(WrkDir, name), "wb") as outfile:
+            outfile.write(contents)
+    Profiler.record(host, "Write the logs of the host", started, time.time())
+
 
+# Function: HostProcess(host, StartTime, EndTime, debug)
+# The steps to be run for each host, open the ssh connection and launch the program.
+def HostProcess(host, StartTime, EndTime, debug):
+
+    # All the ssh to the host goes through a single connection
+    Transport.connect(host)
+
+    # Lets Launch the process.
+    LaunchProcess(
+            host,
+            StartTime,
+            EndTime,
+            debug
+    )
+
+
+# Function: ParallelLauncher(hosts, parallel, StartTime, EndTime, debug)
+# Run the HostProcess on all the hosts, with at most parallel hosts at the same time.
+# Returns the list of hosts where the program failed.
+def ParallelLauncher(hosts, parallel, StartTime, EndTime, debug):
+
+    # Local Variables.
+    pending = Queue.Queue()
+    failed = []
+    workers = []
+
+    logger.info("Launching the program on {0} host(s), {1} at a time".format(
+        len(hosts),
+        parallel
+    ))
+
+    for host in hosts:
+        pending.put(host)
+
+    # Each worker picks the next host that is pending, until there are no more hosts.
+    def worker():
+        while True:
+            try:
+                host = pending.get_nowait()
+            except Queue.Empty:
+                return
+
+            # The steps exit on errors, so lets catch them here and record the host as failed
+            # rather than taking down the rest of the hosts.
+            try:
+                Profiler.runcall(
+                        "coordinator_" + host + "_" + __file__ + ".prof",
+                        HostProcess,
+                        host,
+                        StartTime,
+                        EndTime,
+                        debug
+                )
+            except SystemExit, e:
+                if e.code:
+                    failed.append(host)
+            except Exception, e:
+                logger.error("Program failed on host: \"{0}\" with the error: {1}".format(
                     host,
-                    tempdir,
-                    __file__,
-                    WrkDir
-                ),
-                shell=True
-        )
-    except subprocess.CalledProcessError, e:
-        err = 'Error when trying to copy script to %s:%s' % (host, tempdir)
-        print >> sys.stderr, err
-        sys.exit(1)
+                    e
+                ))
+                failed.append(host)
+
+    for i in range(min(parallel, len(hosts))):
+        t = threading.Thread(target=worker)
+        t.setDaemon(True)
+        t.start()
+        workers.append(t)
+
+    # Wait for all the workers to finish, join with timeout so that the Ctrl-C is not blocked.
+    for t in workers:
+        while t.isAlive():
+            t.join(1)
+
+    return failed
+
+
+# Function: ProfileReporter(hosts, failed)
+# Print the time of each phase of the program on the main host ( coordinator ) and on each host, the ssh to
+# the host is timed on the main host and rest of the phases on the host, along with the peak memory of the host.
+def ProfileReporter(hosts, failed):
+
+    # Local Variables
+    fmt1 = globalVariable.Profilefmt1
+    fmt2 = globalVariable.Profilefmt2
+    fmt3 = globalVariable.Profilefmt3
+    rows = []
+
+    # The phases of the coordinator
+    for phase in Profiler.timings('coordinator'):
+        rows.append(['coordinator'] + phase + [''])
+    if rows:
+        rows[0][-1] = "%.1f" % Profiler.peakrss()
+
+    for host in sorted(hosts):
+
+        # The phases timed on the host are on the profile sent back with the logs
+        phases = Profiler.timings(host)
+        peakrss = ''
+        profilefile = host + "_" + __file__ + ".profile"
+        if host not in failed and os.path.exists(profilefile):
+            with open(profilefile) as f:
+                profile = json.load(f)
+            phases = phases + profile['phases']
+            peakrss = "%.1f" % profile['peakrss']
+        else:
+            logger.warn("There is no profile of the phases on the host: \"{0}\"".format(
+                host
+            ))
+
+        for i in range(len(phases)):
+            rows.append([host] + phases[i] + [peakrss if i == 0 else ''])
+
+    print ""
+    print fmt1.format('')
+    print fmt2.format('Host', 'Phase', 'Calls', 'Time(s)', 'Self(s)', 'Peak RSS(MB)')
+    print fmt1.format('')
+    host = None
+    for row in rows:
+
+        # Line between the hosts
+        if host is not None and row[0] != host:
+            print fmt1.format('')
+        host = row[0]
+
+        print fmt3.format(*row)
+    print fmt1.format('')
+    print ""
+
+
+# Function: TraceWriter(hosts, failed, StartTime, EndTime)
+# Write the stages of the main host ( coordinator ) and of each host on the trace file, in the trace event format.
+# Each host is a process on the trace, with the ssh to the host from the main host and each process of
+# the program on the host as its threads.
+def TraceWriter(hosts, failed, StartTime, EndTime):
+
+    # Local Variables
+    TraceFile = globalVariable.TraceFile
+    events = list(Profiler.events)
+    tracks = {}
+    traceEvents = []
+
+    # The stages on the hosts are on the profile sent back with the logs
+    for host in sorted(hosts):
+        profilefile = host + "_" + __file__ + ".profile"
+        if host not in failed and os.path.exists(profilefile):
+            with open(profilefile) as f:
+                events.extend(json.load(f)['events'])
+        else:
+            logger.warn("There is no trace of the stages on the host: \"{0}\"".format(
+                host
+            ))
+
+    if not events:
+        logger.warn("There are no stages to write on the trace file")
+        return
+
+    # The ids of the hosts & threads on the trace, the main host is the first
+    pids = {'coordinator': 0}
+    for host in sorted(hosts):
+        pids[host] = len(pids)
+    for host in pids:
+        traceEvents.append({'name': 'process_name', 'ph': 'M', 'pid': pids[host], 'tid': 0, 'args': {'name': host}})
+        traceEvents.append({'name': 'process_sort_index', 'ph': 'M', 'pid': pids[host], 'tid': 0,
+                            'args': {'sort_index': pids[host]}})
+
+    # The time on the trace is from the start of the first stage ( in microseconds )
+    start = min([event[3] for event in events])
+    for host, track, name, started, ended, details in sorted(events, key=itemgetter(3)):
+        if (host, track) not in tracks:
+            tracks[(host, track)] = len(tracks) + 1
+            traceEvents.append({'name': 'thread_name', 'ph': 'M', 'pid': pids[host], 'tid': tracks[(host, track)],
+                                'args': {'name': track}})
+
+        traceEvents.append({
+            'name': name,
+            'cat': 'coordinator' if track.startswith('coordinator') else 'host',
+            'ph': 'X',
+            'ts': round((started - start) * 1000000, 1),
+            'dur': round((ended - started) * 1000000, 1),
+            'pid': pids[host],
+            'tid': tracks[(host, track)],
+            'args': details
+        })
+
+    with open(TraceFile, "w") as f:
+        json.dump({
+            'traceEvents': traceEvents,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'program': __file__,
+                'StartTime': StartTime,
+                'EndTime': EndTime
+            }
+        }, f)
+
+    logger.info("The stages of the program on all the hosts are written on the trace file: \"{0}\" ".format(
+        os.path.abspath(TraceFile)
+    ))
 
 
 # Function: main()
 # Go into the main program and execute the steps.
 def main():
 
-    # Local Variables.
-    tempdir = globalVariable.tempdir
-
     # First thing first, parse the arguments passed.
-    filename, StartTime, EndTime, debug = ArgumentParser(sys.argv[1:])
-
-    # Create the temp directory on the host, if not exists
-    if not os.path.exists(tempdir):
-        os.makedirs(tempdir)
+    filename, StartTime, EndTime, debug, parallel, outputformat, profile, trace, transport, delays = \
+        ArgumentParser(sys.argv[1:])
+    globalVariable.outputformat = outputformat
+    globalVariable.profile = profile
+    globalVariable.trace = trace
+
+    # If the profile or the trace is asked for, lets time the phases of the program from here on.
+    Profiler.enable(profile, trace, 'coordinator')
+
+    # Create a temp directory on the host for this run, the hostmap of each host is written
+    # there, if we reused the directory of an earlier run the hosts would get their segments twice.
+    # Lets remove it when the program exits, whether it completed or not.
+    tempdir = tempfile.mkdtemp(prefix='wrkdir_' + __file__ + '_')
+    globalVariable.tempdir = tempdir
+    atexit.register(shutil.rmtree, tempdir, True)
 
     # Call the parseHostfile to split the file contents into a list
     hosts = parseHostfile(
             filename
     )
 
-    # Lets Launch the process.
-    for host in hosts:
-        LaunchProcess(
-                host,
-                StartTime,
-                EndTime,
-                debug
-            )
+    # Lets have a single ssh connection to each host for the whole run ( or the transport asked for ).
+    TransportSetup(transport, delays)
 
-    # If we reach here successfully it means we have been successful in executing
-    # the script without any issues on all the host
-    # so lets remove or cleanup all the work directory we have created.
-    for host in hosts:
-        logger.info("Removing temp work directory: \"{0}\" from host: \"{1}\"".format(
-            tempdir,
-            host
-        ))
-        RemoveTempdir(
-            host,
-            tempdir
+    # Lets Launch the process on all the hosts.
+    failed = ParallelLauncher(
+            hosts,
+            parallel,
+            StartTime,
+            EndTime,
+            debug
     )
 
-    # Okie so we successfully completed all the task, time to megre all the
+    # If the program failed on all the hosts, there is nothing to merge.
+    if len(failed) == len(hosts):
+        if trace:
+            TraceWriter(hosts, failed, StartTime, EndTime)
+        logger.error("Program: \"{0}\" failed on all the host(s): \"{1}\"".format(
+            __file__,
+            ", ".join(sorted(failed))
+            ))
+        sys.exit(1)
+
+    # Okie so we completed all the task, time to megre all the
     # files as one
     OutputFile = OutputFileMerger()
 
+    # And the records from all the hosts as one file, if asked for
+    if outputformat != 'text':
+        RecordFile = RecordFileMerger(
+                outputformat,
+                StartTime,
+                EndTime
+        )
+        logger.info("Backup summary records from all segments are merged onto file: \"{0}\" ".format(
+            os.path.abspath(RecordFile)
+            ))
+
+    # Where did the time go on each host, if asked for
+    if profile:
+        ProfileReporter(hosts, failed)
+
+    # And when, if asked for
+    if trace:
+        TraceWriter(hosts, failed, StartTime, EndTime)
+
+    # If the program failed on any of the host, the summary is missing the information
+    # of those hosts, so lets inform the user and exit with error.
+    if failed:
+        logger.error("Program: \"{0}\" failed on host(s): \"{1}\"".format(
+            __file__,
+            ", ".join(sorted(failed))
+            ))
+        logger.info("Backup summary from the rest of the segments is merged onto file: \"{0}\" ".format(
+            os.path.abspath(OutputFile)
+            ))
+        sys.exit(1)
+
     # Success message
     logger.info("Program: \"{0}\" successfully completed".format(
         __file__
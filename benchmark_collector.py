@@ -0,0 +1,657 @@
+#!/usr/bin/env python
+
+# Benchmark of the backuptime_collector.py, it generates the master and segment csv logs of a backup
+# and times each step the collector runs on the logs of a host, so that the versions of the collector
+# can be compared without a cluster or a backup.
+
+import sys, os, getopt, logging, csv, json, time, random, imp, inspect, resource, multiprocessing, shutil, tempfile
+from datetime import datetime, timedelta
+
+
+# Class: VariableClass()
+# Variables used by the benchmark.
+class VariableClass():
+    def __init__(self):
+
+        # Defaults of the generated logs, the number of tables backed up, number of segments
+        # and size of each logfile (MB).
+        self.tables = 200
+        self.segments = 4
+        self.size = 50
+        self.seed = 1
+
+        # The collector benchmarked, by default the one next to this program.
+        self.collector = os.path.join(os.path.dirname(os.path.realpath(__file__)), "backuptime_collector.py")
+
+        # Day of the logs and the time the backup was run, with the timestamp (key) of the backup.
+        self.day = datetime(2016, 4, 16)
+        self.backupstart = datetime(2016, 4, 16, 12, 0, 0)
+        self.backupkey = "20160416120000"
+        self.date_format = "%Y-%m-%d %H:%M:%S"
+
+        # Part of the rows of the other sessions that are logged before the backup, while the backup
+        # runs ( for every row of the backup ) and how many of their statements are on multiple lines.
+        self.noisebefore = 0.45
+        self.noiseduring = 0.5
+        self.multiline = 0.05
+
+        # The description of the generated logs on the log directory.
+        self.logsinfo = "benchmark_logs.json"
+
+        # The steps timed, in the order they are run.
+        self.phases = ['InputFileMerger', 'MasterLogReader', 'SegmentLogReader', 'SQLOutputFormatter',
+                       'CopyOutputFormatter']
+
+        # Format of the result.
+        self.fmt1 = '|{0:-<24}|{0:->12}|{0:->15}|{0:->12}|{0:->15}|{0:->12}|'
+        self.fmt2 = '|{0:<24}|{1:>12}|{2:>15}|{3:>12}|{4:>15}|{5:>12}|'
+        self.fmt3 = '|{0:<24}|{1:>12.3f}|{2:>15.0f}|{3:>12}|{4:>15.1f}|{5:>12}|'
+
+        # Help documentation
+        self.helpdoc = "OPTIONS:\n\n" \
+          "-t, --tables=N                  Number of tables backed up (Default: 200)\n" \
+          "-s, --segments=N                Number of segments (Default: 4)\n" \
+          "-m, --size=MB                   Size of each logfile in MB (Default: 50)\n" \
+          "-w, --window=day|backup         Read the logs of the whole day or only of the backup (Default: day)\n" \
+          "-l, --logdir=DIRECTORY          Keep the logs on the directory, the logs already there are used again\n" \
+          "-n, --no-multiline              Write every statement on a single line, the versions of the collector before\n" \
+          "                                the rows were streamed to the readers can't read the statements on many lines\n" \
+          "-c, --collector=PROGRAM         The backuptime_collector.py to benchmark (Default: the one next to this program)\n" \
+          "-j, --json=FILE                 Save the result on the file\n" \
+          "-b, --baseline=FILE             Compare with the result saved before by -j\n" \
+          "-h, --help                      Show this help\n\n" \
+          "EXAMPLE:\n\n" \
+          "To benchmark the current version and save the result\n\n" \
+          "\t {0} -m 100 -l /tmp/benchlogs -j current.json\n\n" \
+          "To benchmark another version on the same logs and compare with the result above\n\n" \
+          "\t {0} -l /tmp/benchlogs -c /tmp/old/backuptime_collector.py -b current.json\n\n" \
+          "The older versions of the collector are called the way they were, the logs for the versions before the rows\n" \
+          "were streamed to the readers are to be generated with -n\n\n" \
+          "COLUMN DESCRIPTION:\n\n" \
+          "Time(s)       : The time spent on the step (in seconds)\n" \
+          "Rows/s        : Rows of the logfiles for InputFileMerger, rows read for the readers, statements for the\n" \
+          "                SQLOutputFormatter and tables for the CopyOutputFormatter, per second\n" \
+          "MB/s          : Size of the logfiles read by the step per second\n" \
+          "Peak RSS(MB)  : Peak memory of the process that ran the step, the master and the segments are run\n" \
+          "                on their own process\n" \
+          "vs Baseline   : How many times faster than the baseline\n".format(os.path.basename(__file__))
+
+
+globalVariable = VariableClass()
+logger = logging.getLogger(__file__)
+
+
+# Function: Usage(text)
+# Print the usage and the text, and exit.
+def Usage(text):
+
+    print "\nUSAGE:"
+    print (
+        "{0} "
+        "-t [--tables] "
+        "-s [--segments] "
+        "-m [--size] "
+        "-w [--window] "
+        "-l [--logdir] "
+        "-n [--no-multiline] "
+        "-c [--collector] "
+        "-j [--json] "
+        "-b [--baseline] "
+        "-h [--help] \n".format(
+                os.path.basename(__file__)
+        )
+    )
+    print text
+    sys.exit(2)
+
+
+# Class: LogClock(start)
+# The time of the rows being written on the log.
+class LogClock():
+    def __init__(self, start):
+        self.now = start
+
+    # Move the clock by ms and return the timestamp of the row.
+    def tick(self, ms):
+        self.now += timedelta(microseconds=int(ms * 1000))
+        return self.now.strftime("%Y-%m-%d %H:%M:%S.%f") + " PDT"
+
+
+# Class: LogWriter(logfile, content, rnd)
+# Writes the rows of the segment csv log, the same columns as logged by GPDB.
+class LogWriter():
+    def __init__(self, logfile, content, rnd):
+        self.file = open(logfile, "wb")
+        self.writer = csv.writer(self.file, lineterminator='\n')
+        self.segment = "seg" + str(content)
+        self.rnd = rnd
+        self.rows = 0
+
+    # Write a row of the pid with the message and the query.
+    def row(self, date, pid, message, query=''):
+        row = [''] * 30
+        row[0] = date
+        row[1] = 'gpadmin'
+        row[2] = 'proddb'
+        row[3] = pid
+        row[4] = 'th' + pid[1:]
+        row[5] = '10.0.0.1'
+        row[6] = '5432'
+        row[7] = date[0:19] + " PDT"
+        row[9] = 'con' + pid[1:]
+        row[10] = 'cmd1'
+        row[11] = self.segment
+        row[16] = 'LOG'
+        row[17] = '00000'
+        row[18] = message
+        row[24] = query
+        row[27] = 'postgres.c'
+        row[28] = '1618'
+        self.writer.writerow(row)
+        self.rows += 1
+
+    # Write the statement and its duration ( ms ), as logged with log_statement & log_duration
+    # ( on a single line if asked for ).
+    def statement(self, clock, pid, query, duration):
+        if not globalVariable.multiline:
+            query = query.replace("\n", " ")
+        self.row(clock.tick(0.2), pid, "statement: " + query, query)
+        self.row(clock.tick(duration), pid, "duration: %.3f ms" % duration, query)
+
+    # Write a statement of some other session.
+    def noise(self, clock):
+        rnd = self.rnd
+        pid = "p%d" % rnd.randint(20000, 20100)
+        if rnd.random() < globalVariable.multiline:
+            query = "SELECT o.id, o.amount,\n       c.name\nFROM app.orders o\n" \
+                    "JOIN app.customers c ON c.id = o.customer_id\nWHERE o.id = %d" % rnd.randint(1, 100000)
+        else:
+            query = "SELECT * FROM app.orders WHERE id = %d" % rnd.randint(1, 100000)
+        self.statement(clock, pid, query, rnd.random() * 10)
+
+    def size(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+# Function: LogGenerator(logdir, tables, segments, size, seed)
+# Generate the logs of the master and the segments with a backup of the tables on them, along with some
+# size (MB) of rows of other sessions before, during and after the backup. The description of the logs
+# is saved on the log directory and returned.
+def LogGenerator(logdir, tables, segments, size, seed):
+
+    # Local Variables
+    rnd = random.Random(seed)
+    key = globalVariable.backupkey
+    dumpdir = os.path.join(logdir, "db_dumps", key[0:8])
+    target = size * 1048576
+    info = {
+        'tables': tables,
+        'segments': segments,
+        'size': size,
+        'seed': seed,
+        'multiline': globalVariable.multiline,
+        'logs': [],
+        'backup': None
+    }
+    backupend = globalVariable.backupstart
+
+    os.makedirs(dumpdir)
+    hostmap = open(os.path.join(logdir, "hostmap"), "w")
+
+    for content in [-1] + range(segments):
+        dbid = content + 2
+        logfile = os.path.join(logdir, "gpseg" + str(content), "pg_log", "gpdb-2016-04-16_000000.csv")
+        os.makedirs(os.path.dirname(logfile))
+        log = LogWriter(logfile, content, rnd)
+
+        # The dumps written by the backup
+        dumpfile = os.path.join(dumpdir, "gp_dump_%d_%d_%s.gz" % (content, dbid, key))
+        postdumpfile = os.path.join(dumpdir, "gp_dump_%d_%d_%s_post_data.gz" % (content, dbid, key))
+        for f in [dumpfile, postdumpfile]:
+            with open(f, "wb") as d:
+                d.truncate(1048576 * dbid)
+
+        # The rows of other sessions before the backup, spread over the morning.
+        clock = LogClock(globalVariable.day)
+        spacing = 12 * 3600 * 1000.0 / (target * globalVariable.noisebefore / 400 + 1)
+        while log.size() < target * globalVariable.noisebefore:
+            log.noise(clock)
+            clock.tick(rnd.random() * 2 * spacing)
+
+        # The backup, with the rows of other sessions logged in between.
+        clock = LogClock(globalVariable.backupstart)
+        backup = []
+        if content == -1:
+            backup.append(('p9000', "LOCK TABLE pg_catalog.pg_class IN EXCLUSIVE MODE;", 1.5))
+            for t in range(tables):
+                backup.append(('p9000', "SELECT oid FROM pg_class WHERE relname = 't%d'" % t, rnd.random()))
+            backup.append(('p8000', "gp_dump_agent command line: gp_dump_agent --gp-k %s --gp-d %s "
+                                    "--gp-s p 2> %s/gp_dump_status_%d_%d_%s > %s" %
+                           (key, dumpdir, dumpdir, content, dbid, key, dumpfile), None))
+            for pid in ['p9100', 'p9101']:
+                for t in range(tables):
+                    backup.append((pid, "LOCK TABLE public.t%d IN ACCESS SHARE MODE" % t, rnd.random()))
+            backup.append(('p9100', "SET search_path = public, pg_catalog", 0.1))
+            for t in range(tables):
+                backup.append(('p9100', "SELECT a.attname,\n       a.atttypid\nFROM pg_attribute a\n"
+                                        "WHERE a.attrelid = %d AND a.attnum > 0" % t, rnd.random() * 2))
+            backup.append(('p9000', "COMMIT", 0.2))
+            backup.append(('p8001', "gp_dump_agent command line: gp_dump_agent --gp-k %s --post-data > %s" %
+                           (key, postdumpfile), None))
+        else:
+            pid = 'p%d' % (7000 + content)
+            backup.append(('p8000', "gp_dump_agent command line: gp_dump_agent --gp-k %s --gp-d %s "
+                                    "--gp-s p 2> %s/gp_dump_status_%d_%d_%s > %s" %
+                           (key, dumpdir, dumpdir, content, dbid, key, dumpfile), None))
+            for t in range(tables):
+                backup.append((pid, "LOCK TABLE public.t%d IN ACCESS SHARE MODE" % t, rnd.random()))
+            backup.append((pid, "SET search_path = public, pg_catalog", 0.1))
+            for t in range(tables):
+                backup.append((pid, "SELECT a.attname,\n       a.atttypid\nFROM pg_attribute a\n"
+                                    "WHERE a.attrelid = %d AND a.attnum > 0" % t, rnd.random() * 2))
+                backup.append((pid, "COPY public.t%d (id, amount, created) TO stdout;" % t, rnd.random() * 500))
+
+        for pid, query, duration in backup:
+            if duration is None:
+                log.row(clock.tick(1), pid, query)
+            else:
+                log.statement(clock, pid, query, duration)
+            if rnd.random() < globalVariable.noiseduring:
+                log.noise(clock)
+        backupend = max(backupend, clock.now)
+
+        # And the rest of the rows of other sessions after the backup, till the size of the logfile.
+        spacing = 6 * 3600 * 1000.0 / (target * (1 - globalVariable.noisebefore) / 400 + 1)
+        clock.tick(1000)
+        while log.size() < target:
+            log.noise(clock)
+            clock.tick(rnd.random() * 2 * spacing)
+
+        info['logs'].append({
+            'logfile': logfile,
+            'dbid': str(dbid),
+            'content': str(content),
+            'rows': log.rows,
+            'bytes': log.size()
+        })
+        log.close()
+        hostmap.write("localhost:%s:%d:%d\n" % (logfile, dbid, content))
+
+    hostmap.close()
+
+    info['backup'] = [
+        (globalVariable.backupstart - timedelta(seconds=1)).strftime(globalVariable.date_format),
+        (backupend + timedelta(seconds=1)).strftime(globalVariable.date_format)
+    ]
+    with open(os.path.join(logdir, globalVariable.logsinfo), "w") as f:
+        json.dump(info, f, indent=2)
+
+    return info
+
+
+# Function: PhaseTimer(function, timing)
+# Returns the function that adds the time it took and the number of things it was given to the timing.
+def PhaseTimer(function, timing):
+
+    def timed(*args):
+        start = time.time()
+        try:
+            return function(*args)
+        finally:
+            timing['seconds'] += time.time() - start
+            timing['rows'] += len(args[0]) if isinstance(args[0], list) else 1
+
+    return timed
+
+
+# Function: TimedRows(rows, timing)
+# Generator that passes on the rows, adding the time it took to get each row to the timing.
+def TimedRows(rows, timing):
+
+    rows = iter(rows)
+    while True:
+        start = time.time()
+        try:
+            row = rows.next()
+        except StopIteration:
+            timing['seconds'] += time.time() - start
+            return
+        timing['seconds'] += time.time() - start
+        timing['rows'] += 1
+        yield row
+
+
+# Function: HostBenchmark(collectorfile, logs, StartTime, EndTime, workdir, result)
+# Run the steps the collector runs on a host for the logs on this process, and put the timing
+# of each step along with the peak memory of the process on the result queue.
+def HostBenchmark(collectorfile, logs, StartTime, EndTime, workdir, result):
+
+    # Local Variables
+    timing = {}
+    for phase in globalVariable.phases:
+        timing[phase] = {'seconds': 0.0, 'rows': 0, 'bytes': 0}
+    merger = timing['InputFileMerger']
+    jsondatafile = None
+
+    # The collector is run from the work directory like it is on the hosts, since the name of
+    # its logs are made from the name of the program.
+    os.chdir(workdir)
+    shutil.copy(collectorfile, "backuptime_collector.py")
+    collector = imp.load_source("backuptime_collector", "backuptime_collector.py")
+
+    # The formatters are called by the reports of the readers.
+    formatter = timing['SQLOutputFormatter']
+    collector.SQLOutputFormatter = PhaseTimer(collector.SQLOutputFormatter, formatter)
+
+    # The steps are not called the same way on all the versions of the collector, so that an older version
+    # can be benchmarked for the baseline lets find out how this one calls them. On the older versions
+    # the merger writes the rows on a file for the reader, the reader writes the report itself
+    # and has no state to continue from.
+    mergedfile = inspect.getargspec(collector.InputFileMerger)[0][0] == 'path'
+    reports = hasattr(collector, 'MasterLogReport')
+    state = len(inspect.getargspec(collector.MasterLogReader)[0]) == 3
+
+    for log in logs:
+        segInfo = {
+            'host': 'localhost',
+            'logfile': log['logfile'],
+            'logfiles': [log['logfile']],
+            'dbid': log['dbid'],
+            'content': log['content']
+        }
+
+        # The merger is timed as the reader takes the rows from it ( or while it writes them on the file
+        # for the reader ), the rest of the time is of the reader.
+        if log['content'] == "-1":
+            phase = timing['MasterLogReader']
+            reader = collector.MasterLogReader
+            report = getattr(collector, 'MasterLogReport', None)
+        else:
+            phase = timing['SegmentLogReader']
+            reader = collector.SegmentLogReader
+            report = getattr(collector, 'SegmentLogReport', None)
+
+        if mergedfile:
+            start = time.time()
+            rows = collector.InputFileMerger(os.path.dirname(log['logfile']), log['logfile'], StartTime, EndTime)
+            merger['seconds'] += time.time() - start
+            with open(rows, "rb") as f:
+                for row in f:
+                    merger['rows'] += 1
+        else:
+            rows = TimedRows(collector.InputFileMerger(segInfo['logfiles'], StartTime, EndTime), merger)
+
+        args = [rows, segInfo]
+        if state:
+            args.append({})
+
+        # The time the reader waits on the merger for the rows and the time of the formatters
+        # called by the reader are of those steps.
+        before = merger['seconds']
+        formatted = formatter['seconds']
+        start = time.time()
+        activity = reader(*args)
+        phase['seconds'] += time.time() - start - (merger['seconds'] - before) - (formatter['seconds'] - formatted)
+        phase['rows'] += merger['rows']
+        merger['rows'] = 0
+        merger['bytes'] += log['bytes']
+        phase['bytes'] += log['bytes']
+
+        # The reader that writes the report itself returns the copy data of the segment.
+        if reports:
+            jsondatafile = report(activity, segInfo) or jsondatafile
+        else:
+            jsondatafile = activity or jsondatafile
+        if hasattr(collector, 'ReportFiles'):
+            collector.ReportFiles.flush()
+
+    # The logfile rows are counted by the generator, the merger only returns the rows the readers have use for.
+    merger['rows'] = sum([log['rows'] for log in logs])
+
+    if jsondatafile:
+        phase = timing['CopyOutputFormatter']
+        start = time.time()
+        collector.CopyOutputFormatter(jsondatafile, 'localhost')
+        phase['seconds'] += time.time() - start
+        # The copy data was a single json document before it was a line of json for each segment.
+        if hasattr(collector, 'jsonReader'):
+            data = collector.jsonReader(jsondatafile)
+        else:
+            with open(jsondatafile) as f:
+                data = json.load(f)
+        for tables in data.values():
+            phase['rows'] += len([t for t in tables if t != 'InfoAddonstmts'])
+
+    if hasattr(collector, 'ReportFiles'):
+        collector.ReportFiles.close()
+
+    result.put((timing, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0))
+
+
+# Function: Benchmark(collectorfile, info, StartTime, EndTime)
+# Run the master and the segments each on its own process and return the result of each step.
+def Benchmark(collectorfile, info, StartTime, EndTime):
+
+    # Local Variables
+    result = {}
+    for phase in globalVariable.phases:
+        result[phase] = {'seconds': 0.0, 'rows': 0, 'bytes': 0, 'peakrss': 0.0}
+    workdir = tempfile.mkdtemp(prefix="benchmark_collector_")
+
+    try:
+        for logs in [info['logs'][0:1], info['logs'][1:]]:
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(
+                    target=HostBenchmark,
+                    args=(collectorfile, logs, StartTime, EndTime, workdir, queue)
+            )
+            process.start()
+            process.join()
+
+            # The collector exits on errors, there is nothing to report then.
+            if process.exitcode != 0:
+                logger.error("The benchmark of the collector failed with the exit code: \"{0}\"".format(
+                    process.exitcode
+                ))
+                sys.exit(2)
+            timing, peakrss = queue.get()
+
+            for phase in timing:
+                if not timing[phase]['seconds'] and not timing[phase]['rows']:
+                    continue
+                for key in ['seconds', 'rows', 'bytes']:
+                    result[phase][key] += timing[phase][key]
+                result[phase]['peakrss'] = max(result[phase]['peakrss'], peakrss)
+
+    finally:
+        shutil.rmtree(workdir, True)
+
+    return result
+
+
+# Function: ResultPrinter(result, baseline)
+# Print the result of each step, and how it compares with the baseline if there is one.
+def ResultPrinter(result, baseline):
+
+    # Local Variables
+    fmt1 = globalVariable.fmt1
+    fmt2 = globalVariable.fmt2
+    fmt3 = globalVariable.fmt3
+
+    print ""
+    print fmt1.format('')
+    print fmt2.format('Step', 'Time(s)', 'Rows/s', 'MB/s', 'Peak RSS(MB)', 'vs Baseline')
+    print fmt1.format('')
+    for phase in globalVariable.phases:
+        r = result[phase]
+        seconds = max(r['seconds'], 0.000001)
+        compare = ''
+        throughput = ''
+        if r['bytes']:
+            throughput = "%.2f" % (r['bytes'] / 1048576.0 / seconds)
+        if baseline and phase in baseline['phases'] and r['seconds']:
+            compare = "%.2fx" % (baseline['phases'][phase]['seconds'] / seconds)
+        print fmt3.format(
+            phase,
+            r['seconds'],
+            r['rows'] / seconds,
+            throughput,
+            r['peakrss'],
+            compare
+        )
+    print fmt1.format('')
+    print ""
+
+
+# Function: ArgumentParser(argv)
+# Parse the arguments of the benchmark.
+def ArgumentParser(argv):
+
+    # Local Variables.
+    options = {
+        'tables': globalVariable.tables,
+        'segments': globalVariable.segments,
+        'size': globalVariable.size,
+        'window': 'day',
+        'logdir': None,
+        'collector': globalVariable.collector,
+        'json': None,
+        'baseline': None
+    }
+
+    try:
+        opts, args = getopt.getopt(
+                argv,
+                'ht:s:m:w:l:nc:j:b:',
+                ['help', 'tables=', 'segments=', 'size=', 'window=', 'logdir=', 'no-multiline', 'collector=', 'json=',
+                 'baseline=']
+        )
+    except getopt.GetoptError, e:
+        Usage(e)
+
+    for opt, arg in opts:
+
+        if opt in ('-h', '--help'):
+            Usage(globalVariable.helpdoc)
+
+        elif opt in ('-t', '--tables', '-s', '--segments', '-m', '--size'):
+            name = {'-t': 'tables', '-s': 'segments', '-m': 'size'}.get(opt, opt.lstrip('-'))
+            try:
+                options[name] = int(arg)
+            except ValueError:
+                options[name] = 0
+            if options[name] < 1:
+                Usage("ERROR: " + opt + " should be a number greater than zero")
+
+        elif opt in ('-w', '--window'):
+            if arg not in ('day', 'backup'):
+                Usage("ERROR: -w should be one of: day, backup")
+            options['window'] = arg
+
+        elif opt in ('-l', '--logdir'):
+            options['logdir'] = arg
+
+        elif opt in ('-n', '--no-multiline'):
+            globalVariable.multiline = 0
+
+        elif opt in ('-c', '--collector'):
+            if not os.path.isfile(arg):
+                Usage("ERROR: file \"" + arg + "\" does not exists")
+            options['collector'] = os.path.abspath(arg)
+
+        elif opt in ('-j', '--json'):
+            options['json'] = arg
+
+        elif opt in ('-b', '--baseline'):
+            if not os.path.isfile(arg):
+                Usage("ERROR: file \"" + arg + "\" does not exists")
+            options['baseline'] = arg
+
+    return options
+
+
+# Function: main()
+# Generate the logs ( unless they are there from before ), run the benchmark and print the result.
+def main():
+
+    logging.basicConfig(format='%(asctime)s [%(levelname)s] %(message)s', level=logging.INFO)
+    options = ArgumentParser(sys.argv[1:])
+
+    # Use the logs on the log directory if they are there, else generate them
+    logdir = options['logdir']
+    removelogs = logdir is None
+    if removelogs:
+        logdir = tempfile.mkdtemp(prefix="benchmark_logs_")
+        os.rmdir(logdir)
+
+    try:
+        if os.path.exists(os.path.join(logdir, globalVariable.logsinfo)):
+            logger.info("Using the logs on the directory: \"{0}\"".format(logdir))
+            with open(os.path.join(logdir, globalVariable.logsinfo)) as f:
+                info = json.load(f)
+        else:
+            logger.info("Generating the logs of \"{0}\" tables, \"{1}\" segments of \"{2}\" MB each "
+                        "on the directory: \"{3}\"".format(
+                options['tables'],
+                options['segments'],
+                options['size'],
+                logdir
+            ))
+            start = time.time()
+            info = LogGenerator(logdir, options['tables'], options['segments'], options['size'], globalVariable.seed)
+            logger.info("Generated the logs in \"{0:.1f}\" seconds".format(time.time() - start))
+
+        # The window of the logs read by the collector
+        if options['window'] == 'backup':
+            StartTime, EndTime = info['backup']
+        else:
+            StartTime = globalVariable.day.strftime(globalVariable.date_format)
+            EndTime = (globalVariable.day + timedelta(seconds=86399)).strftime(globalVariable.date_format)
+
+        logger.info("Benchmarking the collector: \"{0}\" from \"{1}\" to \"{2}\"".format(
+            options['collector'],
+            StartTime,
+            EndTime
+        ))
+
+        # Logging of the collector is only on errors, else it takes over the benchmark
+        logging.getLogger().setLevel(logging.ERROR)
+        result = Benchmark(options['collector'], info, StartTime, EndTime)
+        logging.getLogger().setLevel(logging.INFO)
+
+    finally:
+        if removelogs:
+            shutil.rmtree(logdir, True)
+
+    baseline = None
+    if options['baseline']:
+        with open(options['baseline']) as f:
+            baseline = json.load(f)
+
+    print "\nLogs: {0} tables, {1} segments, {2} MB per logfile, window: {3} ( {4} to {5} )".format(
+        info['tables'],
+        info['segments'],
+        info['size'],
+        options['window'],
+        StartTime,
+        EndTime
+    )
+    ResultPrinter(result, baseline)
+
+    if options['json']:
+        with open(options['json'], "w") as f:
+            json.dump({
+                'collector': options['collector'],
+                'logs': dict([(k, info[k]) for k in ['tables', 'segments', 'size', 'seed']]),
+                'window': [StartTime, EndTime],
+                'phases': result
+            }, f, indent=2)
+        logger.info("The result is saved on the file: \"{0}\"".format(options['json']))
+
+
+# Start the main program.
+if __name__ == '__main__':
+    main()
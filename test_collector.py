@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+# Test of the backuptime_collector.py, the collector is run end to end with the local transport
+# on the logs generated by the benchmark_collector.py and the summary merged from the hosts is checked.
+#
+#   python test_collector.py
+
+import sys, os, glob, re, shutil, subprocess, tempfile, unittest
+
+import benchmark_collector
+
+
+# Class: LocalTransportTest()
+# Run the collector with -x local on the master and segment logs of a backup of a few tables.
+class LocalTransportTest(unittest.TestCase):
+
+    # The logs of the backup, the collector reads them for the whole day.
+    tables = 5
+    segments = 2
+    StartTime = "2016-04-16 00:00:00"
+    EndTime = "2016-04-16 23:59:59"
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="test_collector_")
+        self.logdir = os.path.join(self.workdir, "logs")
+        self.info = benchmark_collector.LogGenerator(self.logdir, self.tables, self.segments, 1, 1)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, True)
+
+    # Run the collector on a directory of its own like the user would, and return the merged summary.
+    def RunCollector(self, name):
+
+        rundir = os.path.join(self.workdir, name)
+        os.makedirs(rundir)
+        shutil.copy(
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), "backuptime_collector.py"),
+                rundir
+        )
+
+        process = subprocess.Popen(
+                [sys.executable, "backuptime_collector.py",
+                 "-f", os.path.join(self.logdir, "hostmap"),
+                 "-s", self.StartTime,
+                 "-e", self.EndTime,
+                 "-x", "local"],
+                cwd=rundir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+        )
+        output = process.communicate()[0]
+        self.assertEqual(process.returncode, 0, output)
+
+        OutputFiles = glob.glob(os.path.join(rundir, "*.out"))
+        self.assertEqual(len(OutputFiles), 1, output)
+        with open(OutputFiles[0]) as f:
+            return f.read()
+
+    # Check the summary has every segment and every table backed up, once.
+    def CheckSummary(self, summary):
+
+        self.assertEqual(summary.count("Exclusive Lock requesting PID"), 1)
+        self.assertEqual(len(re.findall(r"Segment Information \(host/dbid/content\) +: localhost / 1 / -1\n", summary)), 3)
+        self.assertEqual(summary.count("Segment Process PID"), self.segments)
+        for log in self.info['logs'][1:]:
+            self.assertEqual(len(re.findall(r"Segment Information \(host/dbid/content\) +: localhost / %s / %s\n" %
+                                            (log['dbid'], log['content']), summary)), 1)
+
+        self.assertEqual(summary.count("Data Backup Time Table(s) for host: localhost"), 1)
+        for t in range(self.tables):
+            self.assertEqual(len(re.findall(r"\|public\.t%d +\|" % t, summary)), 1)
+
+    def test_summary(self):
+        self.CheckSummary(self.RunCollector("run"))
+
+    # Nothing of the earlier run ( the hostmaps of the hosts or the checkpoints ) should end up on the next run.
+    def test_rerun(self):
+        first = self.RunCollector("first")
+        second = self.RunCollector("second")
+        self.CheckSummary(second)
+        self.assertEqual(first, second)
+
+
+# Start the test.
+if __name__ == '__main__':
+    unittest.main()